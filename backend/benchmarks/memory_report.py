@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Memory report: portfolio content as dicts, as Pydantic models, and as the
+compact slot-based records of core/content_store.py.
+
+Every representation is built from freshly decoded JSON (as it arrives from
+MongoDB or the seed data) and measured with tracemalloc after the source
+documents are released, so only what a worker would retain is counted.
+
+Usage (from backend/):
+    python benchmarks/memory_report.py --scale 100
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.content_store import ContentTable, record_type  # noqa: E402
+from core.serialization import validate_many  # noqa: E402
+from data.prasanth_data import (  # noqa: E402
+    DEFAULT_AWARDS, DEFAULT_CERTIFICATIONS, DEFAULT_EXPERIENCE, DEFAULT_PROJECTS,
+    DEFAULT_SKILLS, DEFAULT_TESTIMONIALS
+)
+from server import (  # noqa: E402
+    AwardModel, CertificationModel, ExperienceModel, ProjectModel, SkillModel,
+    TestimonialModel
+)
+
+DATASETS = {
+    "skills": (SkillModel, DEFAULT_SKILLS),
+    "experience": (ExperienceModel, DEFAULT_EXPERIENCE),
+    "projects": (ProjectModel, DEFAULT_PROJECTS),
+    "testimonials": (TestimonialModel, DEFAULT_TESTIMONIALS),
+    "certifications": (CertificationModel, DEFAULT_CERTIFICATIONS),
+    "awards": (AwardModel, DEFAULT_AWARDS),
+}
+
+
+def scaled_json(model, documents: List[Dict[str, Any]], scale: int) -> bytes:
+    """Encoded documents, repeated ``scale`` times with unique identifiers"""
+    fields = list(model.model_fields)
+    expanded = []
+    for copy in range(scale):
+        for document in documents:
+            document = {field: document.get(field) for field in fields}
+            key = "id" if "id" in document else "name"
+            document[key] = f"{document[key]}-{copy}" if copy else document[key]
+            expanded.append(document)
+    return json.dumps(expanded).encode("utf-8")
+
+
+def retained(build: Callable[[bytes], Any], raw: bytes) -> int:
+    """Bytes still allocated once ``build`` returns and its input is dropped"""
+    gc.collect()
+    tracemalloc.start()
+    result = build(raw)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare content memory representations")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Repeat each dataset to simulate larger collections")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    representations = ("dicts", "models", "dicts+models", "compact")
+    print(f"{'collection':<16}{'docs':>7}" + "".join(f"{name:>14}" for name in representations)
+          + "   (KiB retained)")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    totals = dict.fromkeys(representations, 0)
+    for name, (model, documents) in DATASETS.items():
+        raw = scaled_json(model, documents, args.scale)
+        record_class = record_type(f"{name.title()}Record", model.model_fields)
+
+        def dicts_and_models(data: bytes):
+            documents = json.loads(data)
+            return documents, validate_many(model, documents)
+
+        sizes = {
+            "dicts": retained(json.loads, raw),
+            "models": retained(lambda data: validate_many(model, json.loads(data)), raw),
+            "dicts+models": retained(dicts_and_models, raw),
+            "compact": retained(
+                lambda data: ContentTable.from_documents(record_class, json.loads(data)), raw
+            ),
+        }
+        count = len(documents) * args.scale
+        results[name] = {"documents": count, "bytes": sizes}
+        for key, size in sizes.items():
+            totals[key] += size
+        print(f"{name:<16}{count:>7}" + "".join(
+            f"{sizes[key] / 1024:>14.1f}" for key in representations
+        ))
+
+    print(f"{'total':<16}{'':>7}" + "".join(
+        f"{totals[key] / 1024:>14.1f}" for key in representations
+    ))
+    saving = 1 - totals["compact"] / totals["dicts+models"] if totals["dicts+models"] else 0
+    print(f"compact vs dicts+models: {saving:.0%} less memory")
+
+    if args.output:
+        results["total"] = {"bytes": totals}
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Load-test every API route of the portfolio backend in-process.
+
+The app is built with server.create_app() and driven through its lifespan
+by a concurrent httpx client over an ASGI transport, so results measure
+the application itself rather than a network or web server.
+
+Backends:
+    mongo      a local (or MONGO_URL) mongod, using a scratch database
+    mongomock  an in-memory mock (pip install mongomock-motor)
+    snapshot   PORTFOLIO_MODE=snapshot, no database at all
+
+Usage (from backend/):
+    python benchmarks/run_benchmarks.py --backend mongomock --concurrency 32 \\
+        --requests 2000 --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --max-regression 0.15
+
+Exits with status 1 when any request fails, or when a route regresses past
+--max-regression against the baseline (lower RPS or higher p95 latency).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from core.settings import Settings  # noqa: E402
+
+BASE_URL = "http://benchmark"
+
+CONTACT_FORM = {
+    "name": "Benchmark",
+    "email": "benchmark@example.com",
+    "subject": "Load test",
+    "message": "Submitted by the benchmark harness",
+}
+
+
+class Scenario:
+    """One request shape to benchmark"""
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        method: str = "GET",
+        json_body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        expected_status: int = 200
+    ):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.json_body = json_body
+        self.headers = headers or {}
+        self.expected_status = expected_status
+
+
+def build_scenarios() -> List[Scenario]:
+    """Every route in server.py, plus the common query variants"""
+    return [
+        Scenario("health", "/api/health"),
+        Scenario("health_live", "/api/health/live"),
+        Scenario("health_ready", "/api/health/ready"),
+        Scenario("profile", "/api/profile"),
+        Scenario("skills", "/api/skills"),
+        Scenario("skills_not_modified", "/api/skills", expected_status=304),
+        Scenario("experience", "/api/experience"),
+        Scenario("projects", "/api/projects"),
+        Scenario("projects_by_category", "/api/projects?category=Model-Based%20Development"),
+        Scenario("projects_page", "/api/projects?limit=2&fields=id,title"),
+        Scenario("projects_ndjson", "/api/projects?format=ndjson"),
+        Scenario("testimonials", "/api/testimonials"),
+        Scenario("certifications", "/api/certifications"),
+        Scenario("awards", "/api/awards"),
+        Scenario("stats", "/api/stats"),
+        Scenario("portfolio", "/api/portfolio"),
+        Scenario("portfolio_fields", "/api/portfolio?fields=profile,stats"),
+        Scenario("contact", "/api/contact", method="POST", json_body=CONTACT_FORM),
+        Scenario("metrics", "/metrics"),
+    ]
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def max_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    total_requests: int,
+    concurrency: int,
+    warmup: int,
+    trace_memory: bool
+) -> Dict[str, Any]:
+    """Send ``total_requests`` requests from ``concurrency`` workers"""
+    headers = dict(scenario.headers)
+    if scenario.expected_status == 304:
+        # Conditional GET with the current ETag
+        response = await client.get(scenario.path)
+        headers["If-None-Match"] = response.headers.get("etag", "")
+
+    async def send() -> httpx.Response:
+        return await client.request(
+            scenario.method, scenario.path, json=scenario.json_body, headers=headers
+        )
+
+    for _ in range(warmup):
+        await send()
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = total_requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await send()
+                ok = response.status_code == scenario.expected_status
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    peak_alloc = None
+    if trace_memory:
+        _, peak_alloc = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies.sort()
+    result = {
+        "method": scenario.method,
+        "path": scenario.path,
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latencyMs": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "maxRssMb": max_rss_mb(),
+    }
+    if peak_alloc is not None:
+        result["peakAllocatedMb"] = round(peak_alloc / (1024 * 1024), 3)
+    return result
+
+
+def build_settings(args, workdir: str) -> Settings:
+    environ = dict(os.environ)
+    environ.update({
+        "PORTFOLIO_MODE": "snapshot" if args.backend == "snapshot" else "mongo",
+        "DATABASE_NAME": args.database,
+        "CONTACT_STORE_PATH": os.path.join(workdir, "contacts.jsonl"),
+        "CONTACT_JOURNAL_PATH": os.path.join(workdir, "contacts_journal.jsonl"),
+        "INDEX_EXPLAIN_CHECK": "false",
+        "ACCESS_LOG_SAMPLE_RATE": str(args.access_log_sample_rate),
+        "LOG_LEVEL": args.log_level,
+    })
+    return Settings(environ)
+
+
+def use_mongomock() -> None:
+    """Point the app's Motor client at mongomock-motor"""
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        sys.exit("The mongomock backend needs mongomock-motor: pip install mongomock-motor")
+    import core.resources
+    core.resources.AsyncIOMotorClient = AsyncMongoMockClient
+
+
+async def run(args) -> Dict[str, Any]:
+    if args.backend == "mongomock":
+        use_mongomock()
+    from server import create_app
+
+    scenarios = build_scenarios()
+    if args.routes:
+        wanted = set(args.routes.split(","))
+        scenarios = [scenario for scenario in scenarios if scenario.name in wanted]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        app = create_app(build_settings(args, workdir))
+        limits = httpx.Limits(max_connections=args.concurrency)
+        results: Dict[str, Any] = {}
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url=BASE_URL, limits=limits
+            ) as client:
+                for scenario in scenarios:
+                    results[scenario.name] = await run_scenario(
+                        client, scenario, args.requests, args.concurrency,
+                        args.warmup, args.trace_memory
+                    )
+                    print_row(scenario.name, results[scenario.name])
+
+    return {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "backend": args.backend,
+            "concurrency": args.concurrency,
+            "requestsPerRoute": args.requests,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": git_commit(),
+        },
+        "routes": results,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def print_header() -> None:
+    print(f"{'route':<24}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'rss MiB':>10}")
+
+
+def print_row(name: str, result: Dict[str, Any]) -> None:
+    latency = result["latencyMs"]
+    print(
+        f"{name:<24}{result['rps']:>10.1f}{latency['p50']:>10.3f}{latency['p95']:>10.3f}"
+        f"{latency['p99']:>10.3f}{result['errors']:>8}{result['maxRssMb']:>10.1f}"
+    )
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Describe every route that got slower than the baseline allows"""
+    failures = []
+    for name, current in results["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if previous is None:
+            continue
+        if previous["rps"] and current["rps"] < previous["rps"] * (1 - max_regression):
+            failures.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+        previous_p95 = previous["latencyMs"]["p95"]
+        current_p95 = current["latencyMs"]["p95"]
+        if previous_p95 and current_p95 > previous_p95 * (1 + max_regression):
+            failures.append(f"{name}: p95 {previous_p95}ms -> {current_p95}ms")
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every portfolio API route")
+    parser.add_argument("--backend", choices=["mongo", "mongomock", "snapshot"], default="mongomock")
+    parser.add_argument("--database", default="portfolio_benchmark",
+                        help="Scratch database name for the mongo backend")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per route")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per route")
+    parser.add_argument("--routes", help="Comma separated scenario names (default: all)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record peak Python allocations per route (slows requests)")
+    parser.add_argument("--access-log-sample-rate", type=float, default=0.0)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Compare against a previous results file")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="Allowed fractional drop in rps or rise in p95 (default 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    print_header()
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+        print(f"Results written to {args.output}")
+
+    failures = [
+        f"{name}: {result['errors']} failed requests"
+        for name, result in results["routes"].items() if result["errors"]
+    ]
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        failures += compare(results, baseline, args.max_regression)
+
+    if failures:
+        print("Benchmark failed:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    if args.baseline:
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
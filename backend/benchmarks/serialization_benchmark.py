@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the validate + encode path for every content collection.
+
+Compares the original path (one model constructor call per document, then
+model_dump and json.dumps) with the TypeAdapter validation and each
+serializer engine in core/serialization.py.
+
+Usage (from backend/):
+    python benchmarks/serialization_benchmark.py --repeat 2000 --scale 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.responses import encode_json  # noqa: E402
+from core.serialization import ENGINES, Serializer, orjson, validate_many  # noqa: E402
+from data.prasanth_data import (  # noqa: E402
+    DEFAULT_AWARDS, DEFAULT_CERTIFICATIONS, DEFAULT_EXPERIENCE, DEFAULT_PROJECTS,
+    DEFAULT_SKILLS, DEFAULT_STATS, DEFAULT_TESTIMONIALS
+)
+from server import (  # noqa: E402
+    AwardModel, CertificationModel, ExperienceModel, ProjectModel, SkillModel,
+    TestimonialModel
+)
+
+DATASETS = {
+    "skills": (SkillModel, DEFAULT_SKILLS),
+    "experience": (ExperienceModel, DEFAULT_EXPERIENCE),
+    "projects": (ProjectModel, DEFAULT_PROJECTS),
+    "testimonials": (TestimonialModel, DEFAULT_TESTIMONIALS),
+    "certifications": (CertificationModel, DEFAULT_CERTIFICATIONS),
+    "awards": (AwardModel, DEFAULT_AWARDS),
+}
+
+
+def projected(model, documents: List[Dict[str, Any]], scale: int) -> List[Dict[str, Any]]:
+    """Documents as the repository returns them: model fields only"""
+    fields = list(model.model_fields)
+    return [
+        {field: document[field] for field in fields if field in document}
+        for document in documents
+    ] * scale
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+    """Best-of-five microseconds per call"""
+    timer = timeit.Timer(function)
+    return min(timer.repeat(repeat=5, number=repeat)) / repeat * 1_000_000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark validation and JSON encoding")
+    parser.add_argument("--repeat", type=int, default=1000, help="Calls per timing run")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Multiply each dataset to simulate larger collections")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    print(f"orjson: {'available' if orjson is not None else 'not installed'}")
+    header = f"{'collection':<16}{'docs':>6}{'original':>12}{'validate':>12}"
+    header += "".join(f"{engine:>12}" for engine in ENGINES)
+    print(header + "   (microseconds per call)")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, (model, documents) in DATASETS.items():
+        documents = projected(model, documents, args.scale)
+        validated = validate_many(model, documents)
+
+        def original():
+            return encode_json([model(**document) for document in documents])
+
+        timings = {
+            "original": measure(original, args.repeat),
+            "validate": measure(lambda: validate_many(model, documents), args.repeat),
+        }
+        for engine in ENGINES:
+            serializer = Serializer(engine)
+            timings[engine] = measure(lambda: serializer.encode(validated), args.repeat)
+
+        results[name] = {"documents": len(documents), "microseconds": timings}
+        print(
+            f"{name:<16}{len(documents):>6}"
+            + "".join(f"{timings[key]:>12.1f}" for key in ("original", "validate", *ENGINES))
+        )
+
+    stats_timings = {
+        engine: measure(lambda: Serializer(engine).encode(DEFAULT_STATS, "stats"), args.repeat)
+        for engine in ENGINES
+    }
+    results["stats"] = {"documents": 1, "microseconds": stats_timings}
+    print(f"{'stats (dict)':<16}{1:>6}{'':>24}" + "".join(
+        f"{stats_timings[engine]:>12.1f}" for engine in ENGINES
+    ))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
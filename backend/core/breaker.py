@@ -0,0 +1,167 @@
+# Circuit breaker for calls to MongoDB
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, Type
+
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, WTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the database is unreachable or overloaded. Anything else
+# (a bad query, a duplicate key) is the caller's problem and does not count.
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (
+    ConnectionFailure, ExecutionTimeout, WTimeoutError, asyncio.TimeoutError
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the database while the circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Stops calling a dependency once most recent calls to it have failed.
+
+    Outcomes of the last ``window_size`` calls are kept; once at least
+    ``min_calls`` are recorded and the share of transient failures reaches
+    ``failure_rate``, the circuit opens and calls fail immediately with
+    ``CircuitOpenError``. After ``reset_timeout`` seconds it is half-open:
+    up to ``half_open_max_calls`` probe calls go through, and the first
+    probe result closes the circuit again or re-opens it.
+
+    Calls slower than ``call_timeout`` seconds are abandoned and count as
+    failures, so a hanging database trips the circuit as well.
+    """
+
+    def __init__(
+        self,
+        name: str = "mongodb",
+        failure_rate: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        reset_timeout: float = 10.0,
+        half_open_max_calls: int = 1,
+        call_timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.call_timeout = call_timeout
+
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed (0 unless open)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def check(self) -> None:
+        """Fail fast while open, without taking a call slot"""
+        if self.state == OPEN:
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    async def call(self, function: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``await function()`` through the breaker"""
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_max_calls):
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after())
+        probe = state == HALF_OPEN
+        if probe:
+            self._probes += 1
+
+        try:
+            if self.call_timeout is None:
+                result = await function()
+            else:
+                # asyncio.timeout, unlike wait_for, never swallows a
+                # cancellation that arrives as the call completes
+                async with asyncio.timeout(self.call_timeout):
+                    result = await function()
+        except TRANSIENT_ERRORS:
+            self._record(False, probe)
+            raise
+        except BaseException:
+            # Not a database failure (or the caller went away): no verdict
+            if probe:
+                self._probes -= 1
+            raise
+        self._record(True, probe)
+        return result
+
+    def _record(self, success: bool, probe: bool) -> None:
+        if probe:
+            self._probes -= 1
+            if self._state != HALF_OPEN:
+                return
+            if success:
+                self._close()
+            else:
+                self._open()
+            return
+
+        if self._state != CLOSED:
+            # Calls that started before the circuit opened
+            return
+        self._outcomes.append(success)
+        if len(self._outcomes) >= self.min_calls and self._current_failure_rate() >= self.failure_rate:
+            self._open()
+
+    def _current_failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _open(self) -> None:
+        if self._state == CLOSED:
+            logger.warning(
+                f"Circuit {self.name} opened after {self._current_failure_rate():.0%} of "
+                f"{len(self._outcomes)} calls failed"
+            )
+        else:
+            logger.warning(f"Circuit {self.name} probe failed, staying open")
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self.trips += 1
+
+    def _close(self) -> None:
+        logger.info(f"Circuit {self.name} closed, probe succeeded")
+        self._state = CLOSED
+        self._outcomes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "open": int(state != CLOSED),
+            "failureRate": round(self._current_failure_rate(), 4),
+            "calls": len(self._outcomes),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,241 @@
+# In-process read-through cache for portfolio content collections
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, Tuple[Hashable, ...]]
+Loader = Callable[[], Awaitable[Any]]
+
+
+class CacheEntry:
+    """A cached value, the time it stops being fresh and how to reload it"""
+
+    __slots__ = ("value", "expires_at", "loader")
+
+    def __init__(self, value: Any, expires_at: float, loader: Optional[Loader] = None):
+        self.value = value
+        self.expires_at = expires_at
+        self.loader = loader
+
+
+class CollectionCache:
+    """Read-through cache keyed by collection name and query parameters.
+
+    Entries expire after ``ttl_seconds`` (never, if None) and the least
+    recently used entry is evicted once ``max_entries`` is reached. Writers
+    call ``invalidate`` with the collections they touched so readers never
+    see data older than the last write made through this process; external
+    change feeds call ``refresh`` to reload entries in place instead.
+    Concurrent misses for the same key share a single load.
+
+    Expired entries are served stale while one background load revalidates
+    them. The last value loaded for each key is also kept apart from the
+    entries (surviving expiry, eviction and invalidation) and is returned
+    when a load fails, so reads keep working while the database is down.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = 300.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._last_good: "OrderedDict[CacheKey, Any]" = OrderedDict()
+        self._loads = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+        # Bumped by invalidate so loads that started earlier are not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.fallbacks = 0
+
+    def _expiry(self) -> float:
+        if self.ttl_seconds is None:
+            return math.inf
+        return time.monotonic() + self.ttl_seconds
+
+    def set(
+        self,
+        collection: str,
+        value: Any,
+        *params: Hashable,
+        loader: Optional[Loader] = None
+    ) -> None:
+        """Store a value, evicting the least recently used entries if full"""
+        key = (collection, params)
+        value = self._unchanged(key, value)
+        self._entries[key] = CacheEntry(value, self._expiry(), loader)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._remember(key, value)
+
+    def _unchanged(self, key: CacheKey, value: Any) -> Any:
+        """The value already held for a key if a reload produced the same version.
+
+        Keeps work done on the held value (e.g. compressed variants) when a
+        reload finds nothing new.
+        """
+        previous = self._last_good.get(key)
+        if previous is not None and value is not None and _version(previous) == _version(value):
+            return previous
+        return value
+
+    def _remember(self, key: CacheKey, value: Any) -> None:
+        """Keep the last loaded value for a key as a fallback for failed loads"""
+        if value is None:
+            self._last_good.pop(key, None)
+            return
+        self._last_good[key] = value
+        self._last_good.move_to_end(key)
+        while len(self._last_good) > self.max_entries:
+            self._last_good.popitem(last=False)
+
+    async def get_or_load(
+        self,
+        collection: str,
+        loader: Loader,
+        *params: Hashable,
+        reloader: Optional[Loader] = None
+    ) -> Any:
+        """Return the cached value for a key, loading and storing it on a miss.
+
+        An expired entry is returned as is while it reloads in the
+        background; a failed load falls back to the last good value.
+        ``reloader`` (``loader`` by default) is kept with the entry and used
+        for revalidation and ``refresh``, which must see the latest data.
+        """
+        reloader = reloader or loader
+        key = (collection, params)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if entry.expires_at > time.monotonic():
+                self.hits += 1
+                return entry.value
+
+        generation = self._generation
+
+        def storing(load_value: Loader) -> Loader:
+            async def load() -> Any:
+                value = await load_value()
+                if generation == self._generation:
+                    if value is not None:
+                        self.set(collection, value, *params, loader=reloader)
+                    else:
+                        self._last_good.pop(key, None)
+                return value
+            return load
+
+        if entry is not None:
+            self.stale_hits += 1
+            self._revalidate(key, storing(reloader))
+            return entry.value
+
+        self.misses += 1
+        try:
+            return await self._loads.do(key, storing(loader))
+        except Exception as e:
+            fallback = self._last_good.get(key)
+            if fallback is None:
+                raise
+            self.fallbacks += 1
+            logger.debug(f"Serving last good {collection} after failed load: {e}")
+            return fallback
+
+    def _revalidate(self, key: CacheKey, load: Loader) -> None:
+        """Reload a stale entry without making the caller wait"""
+        async def revalidate():
+            try:
+                await self._loads.do(key, load)
+            except Exception as e:
+                logger.debug(f"Background reload of {key[0]} failed: {e}")
+
+        task = asyncio.ensure_future(revalidate())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def refresh(self, *collections: str) -> Set[str]:
+        """Reload every cached entry of the given collections and swap it in.
+
+        Readers keep getting the previous value until the new one replaces
+        it, so a refresh never causes a miss. A failed reload keeps the old
+        value. Returns the collections whose content actually changed.
+        """
+        targets = set(collections)
+        keys = [
+            key for key, entry in self._entries.items()
+            if key[0] in targets and entry.loader is not None
+        ]
+
+        changed: Set[str] = set()
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            try:
+                value = await entry.loader()
+            except Exception as e:
+                logger.warning(f"Failed to refresh cached {key[0]}: {e}")
+                continue
+
+            current = self._entries.get(key)
+            if current is None:
+                # Invalidated or evicted while reloading; the next read loads it
+                continue
+            if value is None:
+                del self._entries[key]
+                self._last_good.pop(key, None)
+                changed.add(key[0])
+                continue
+            if _version(current.value) != _version(value):
+                changed.add(key[0])
+            value = self._unchanged(key, value)
+            self._entries[key] = CacheEntry(value, self._expiry(), entry.loader)
+            self._remember(key, value)
+        return changed
+
+    def invalidate(self, *collections: str) -> int:
+        """Drop every entry for the given collections (all entries if none given)"""
+        self._generation += 1
+        targets = set(collections)
+        for key in self._loads.keys():
+            if not collections or key[0] in targets:
+                self._loads.forget(key)
+
+        if not collections:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+
+        stale = [key for key in self._entries if key[0] in targets]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalescedLoads": self._loads.coalesced,
+            "staleHits": self.stale_hits,
+            "fallbacks": self.fallbacks,
+            "lastGoodEntries": len(self._last_good),
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _version(value: Any) -> Any:
+    """Comparable version of a cached value (its ETag when it has one)"""
+    return getattr(value, "etag", value)
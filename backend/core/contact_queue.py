@@ -0,0 +1,292 @@
+# Write-behind queue for contact form submissions
+import asyncio
+import glob
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo.errors import BulkWriteError
+
+from core.breaker import CircuitBreaker, CircuitOpenError
+from core.tasks import cancel_and_wait
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+Document = Dict[str, Any]
+
+
+class ContactWriteQueue:
+    """Accepts submissions immediately and persists them in the background.
+
+    Documents are buffered in a bounded in-process queue and written with
+    ``insert_many`` once ``batch_size`` documents are waiting or
+    ``flush_interval`` seconds have passed. Failed batches are retried with
+    exponential backoff; while the circuit breaker reports the database
+    down, the batch is held until a probe is allowed. Anything that cannot
+    be queued or written (queue overflow, retries exhausted, shutdown) is
+    appended to a local journal file, which is replayed after the next
+    successful write and on every start.
+
+    Journal writes run in a worker thread so a spill never blocks the event
+    loop. Several processes may share one journal: a replay first renames
+    the file to a private name, so lines appended meanwhile by other
+    processes land in a fresh journal instead of being deleted.
+    """
+
+    def __init__(
+        self,
+        collection,
+        journal_path: str,
+        max_size: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 0.5,
+        max_retries: int = 5,
+        retry_base_delay: float = 0.2,
+        on_flush: Optional[Callable[[int], Awaitable[None]]] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.collection = collection
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.on_flush = on_flush
+        self.breaker = breaker
+
+        self._queue: "asyncio.Queue[Document]" = asyncio.Queue(maxsize=max_size)
+        self._stopping = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight: List[Document] = []
+        self._journal_lock = threading.Lock()
+        # Set whenever this process journals; cleared by a replay. An idle
+        # worker retries the replay once the loop clock reaches _replay_at.
+        self._journal_pending = False
+        self._replay_at = 0.0
+
+        self.written = 0
+        self.journaled = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, document: Document) -> None:
+        """Queue a document for writing; spill it to the journal if the queue is full"""
+        try:
+            self._queue.put_nowait(document)
+        except asyncio.QueueFull:
+            logger.warning("Contact queue full, journaling submission")
+            await self._journal([document])
+
+    async def start(self) -> None:
+        """Replay any journaled submissions, then start the background writer"""
+        try:
+            await self.replay_journal()
+        except Exception as e:
+            # The journal is kept and replayed by the worker once writes succeed
+            logger.error(f"Failed to replay contact journal: {e}")
+            self._journal_pending = True
+        self._stopping.clear()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything still queued; journal whatever cannot be written in time"""
+        if self._worker is None:
+            return
+
+        self._stopping.set()
+        await asyncio.wait({self._worker}, timeout=timeout)
+        if not self._worker.done():
+            logger.warning("Contact queue did not drain in time, journaling the rest")
+            await cancel_and_wait(self._worker)
+            remaining = list(self._in_flight)
+            while not self._queue.empty():
+                remaining.append(self._queue.get_nowait())
+            await self._journal(remaining)
+        self._worker = None
+
+    async def _run(self) -> None:
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = await self._next_batch()
+            if batch:
+                self._in_flight = batch
+                await self._flush(batch)
+                self._in_flight = []
+            elif self._journal_pending and asyncio.get_running_loop().time() >= self._replay_at:
+                await self._replay_pending()
+
+    async def _next_batch(self) -> List[Document]:
+        """Collect up to batch_size documents, waiting at most flush_interval"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        batch: List[Document] = []
+
+        while len(batch) < self.batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0 or (self._stopping.is_set() and batch):
+                break
+            try:
+                async with asyncio.timeout(remaining):
+                    batch.append(await self._queue.get())
+            except TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: List[Document]) -> None:
+        """Write a batch, retrying with backoff; journal it if every attempt fails"""
+        attempt = 0
+        while attempt < self.max_retries:
+            try:
+                inserted = await self._insert(batch)
+            except CircuitOpenError as e:
+                if self._stopping.is_set():
+                    logger.warning(f"Database unavailable at shutdown, journaling {len(batch)} contact submissions")
+                    await self._journal(batch)
+                    return
+                # The database is known to be down: hold the batch (without
+                # using up retries) until the breaker lets a probe through
+                await self._pause(max(e.retry_after, self.retry_base_delay))
+                continue
+            except Exception as e:
+                attempt += 1
+                delay = self.retry_base_delay * (2 ** (attempt - 1))
+                logger.warning(
+                    f"Contact batch write failed (attempt {attempt}/{self.max_retries}): {e}"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.written += inserted
+            if self.on_flush and inserted:
+                await self.on_flush(inserted)
+            if self._journal_pending:
+                await self._replay_pending()
+            return
+
+        logger.error(f"Giving up on {len(batch)} contact submissions, journaling them")
+        await self._journal(batch)
+
+    async def _pause(self, delay: float) -> None:
+        """Sleep for ``delay`` seconds, waking early when stopping"""
+        try:
+            async with asyncio.timeout(delay):
+                await self._stopping.wait()
+        except TimeoutError:
+            pass
+
+    async def _replay_pending(self) -> None:
+        """Replay the journal, backing off until the next attempt if it fails"""
+        try:
+            await self.replay_journal()
+        except CircuitOpenError as e:
+            self._retry_replay(e.retry_after)
+        except Exception as e:
+            logger.warning(f"Failed to replay contact journal: {e}")
+            self._retry_replay(self.retry_base_delay * (2 ** (self.max_retries - 1)))
+
+    def _retry_replay(self, delay: float) -> None:
+        self._journal_pending = True
+        self._replay_at = asyncio.get_running_loop().time() + max(delay, self.retry_base_delay)
+
+    async def _insert(self, batch: List[Document]) -> int:
+        """Insert a batch; documents already present (from a retry) count as written"""
+        def insert():
+            return self.collection.insert_many(batch, ordered=False)
+        try:
+            if self.breaker is None:
+                result = await insert()
+            else:
+                result = await self.breaker.call(insert)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            return e.details.get("nInserted", 0)
+
+    async def _journal(self, documents: List[Document]) -> None:
+        if not documents:
+            return
+        # insert_many adds an ObjectId _id; the unique id field is enough
+        data = b"".join(
+            json.dumps(
+                {key: value for key, value in document.items() if key != "_id"},
+                separators=(",", ":")
+            ).encode("utf-8") + b"\n"
+            for document in documents
+        )
+        await asyncio.to_thread(self._append_journal, data)
+        self.journaled += len(documents)
+        self._journal_pending = True
+
+    def _append_journal(self, data: bytes) -> None:
+        with self._journal_lock, open(self.journal_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _claim_journals(self) -> List[str]:
+        """Move the journal to a private name; also pick up claims left by crashes"""
+        claimed = glob.glob(glob.escape(self.journal_path) + ".replay-*")
+        claim = f"{self.journal_path}.replay-{os.getpid()}-{uuid.uuid4().hex}"
+        with self._journal_lock:
+            try:
+                os.replace(self.journal_path, claim)
+                claimed.append(claim)
+            except FileNotFoundError:
+                pass
+        return claimed
+
+    async def replay_journal(self) -> None:
+        """Write journaled submissions to the database and clear the journal.
+
+        Documents already written by an earlier, interrupted replay are
+        skipped by the unique index on ``id``.
+        """
+        self._journal_pending = False
+        for path in await asyncio.to_thread(self._claim_journals):
+            try:
+                documents = await asyncio.to_thread(_read_journal, path)
+            except FileNotFoundError:
+                # Another process replayed this claim first
+                continue
+
+            for start in range(0, len(documents), self.batch_size):
+                inserted = await self._insert(documents[start:start + self.batch_size])
+                self.written += inserted
+                if self.on_flush and inserted:
+                    await self.on_flush(inserted)
+
+            await asyncio.to_thread(_remove, path)
+            if documents:
+                logger.info(f"Replayed {len(documents)} journaled contact submissions")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "maxSize": self._queue.maxsize,
+            "inFlight": len(self._in_flight),
+            "written": self.written,
+            "journaled": self.journaled,
+        }
+
+
+def _read_journal(path: str) -> List[Document]:
+    with open(path, "rb") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,86 @@
+# Compact, immutable in-memory representation of portfolio content
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator, Tuple, Type
+
+from pydantic import BaseModel
+
+
+class Record(Mapping):
+    """Read-only, slot-backed document.
+
+    Each collection gets a subclass whose ``__slots__`` are its fields, so
+    a record stores one pointer per field instead of a hash table, and the
+    field names are stored once on the class. Records behave as read-only
+    mappings, which is all the in-memory paging helpers need.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, values: Iterable[Any]):
+        for field, value in zip(self.__slots__, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, field: str) -> Any:
+        try:
+            return getattr(self, field)
+        except (AttributeError, TypeError):
+            raise KeyError(field) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def record_type(name: str, fields: Iterable[str]) -> Type[Record]:
+    """Create the record class for a collection"""
+    return type(name, (Record,), {"__slots__": tuple(fields)})
+
+
+def compact(value: Any) -> Any:
+    """Intern strings and freeze lists so repeated values are stored once"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(compact(item) for item in value)
+    return value
+
+
+class ContentTable:
+    """Immutable sequence of records for one collection query"""
+
+    __slots__ = ("record_type", "records")
+
+    def __init__(self, record_type: Type[Record], records: Tuple[Record, ...]):
+        self.record_type = record_type
+        self.records = records
+
+    @classmethod
+    def from_documents(
+        cls,
+        record_type: Type[Record],
+        documents: Iterable[Any]
+    ) -> "ContentTable":
+        """Build from models or dicts, keeping only the record type's fields"""
+        records = []
+        for document in documents:
+            if isinstance(document, BaseModel):
+                values = (getattr(document, field) for field in record_type.__slots__)
+            else:
+                values = (document.get(field) for field in record_type.__slots__)
+            records.append(record_type(compact(value) for value in values))
+        return cls(record_type, tuple(records))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Record]:
+        return iter(self.records)
@@ -0,0 +1,112 @@
+# Background dependency checks behind the readiness probe
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from core.tasks import cancel_and_wait
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Pings MongoDB on a fixed interval and keeps the latest result.
+
+    Probes read ``status()`` and never touch the database themselves, so
+    they cost the same however often they arrive. At most one ping is
+    outstanding: if a ping outlives ``timeout`` the database is reported
+    down, and later checks wait on that same ping instead of piling up
+    new ones behind a slow server.
+    """
+
+    def __init__(self, client, interval: float = 5.0, timeout: float = 2.0):
+        self.client = client
+        self.interval = interval
+        self.timeout = timeout
+
+        self.healthy = False
+        self.latency_ms: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.checked_at_iso: Optional[str] = None
+        self.error: Optional[str] = "not checked yet"
+        self.checks = 0
+        self.failures = 0
+
+        self._ping: Optional[asyncio.Future] = None
+        self._ping_started = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Run a first check, then keep checking in the background"""
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._ping):
+            if task is not None:
+                await cancel_and_wait(task)
+        self._task = None
+        self._ping = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def check(self) -> bool:
+        """Ping the database once and record the outcome"""
+        if self._ping is None or self._ping.done():
+            self._ping = asyncio.ensure_future(self.client.admin.command("ping"))
+            self._ping_started = time.perf_counter()
+
+        try:
+            async with asyncio.timeout(self.timeout):
+                await asyncio.shield(self._ping)
+        except TimeoutError:
+            self._record(False, f"ping timed out after {self.timeout}s")
+        except Exception as e:
+            self._record(False, str(e))
+        else:
+            self._record(True, None, (time.perf_counter() - self._ping_started) * 1000)
+        return self.healthy
+
+    def _record(self, healthy: bool, error: Optional[str], latency_ms: Optional[float] = None) -> None:
+        if healthy != self.healthy:
+            if healthy:
+                logger.info("MongoDB is reachable again")
+            else:
+                logger.warning(f"MongoDB health check failed: {error}")
+        self.healthy = healthy
+        self.error = error
+        self.latency_ms = round(latency_ms, 2) if latency_ms is not None else None
+        self.checked_at = time.monotonic()
+        self.checked_at_iso = datetime.now(timezone.utc).isoformat()
+        self.checks += 1
+        if not healthy:
+            self.failures += 1
+
+    @property
+    def stale(self) -> bool:
+        """True when the pinger has stopped reporting (e.g. its task died)"""
+        if self.checked_at is None:
+            return True
+        return time.monotonic() - self.checked_at > 3 * self.interval + self.timeout
+
+    @property
+    def ready(self) -> bool:
+        return self.healthy and not self.stale
+
+    def status(self) -> Dict[str, Any]:
+        """Latest check result; never waits on the database"""
+        error = self.error
+        if error is None and self.stale:
+            error = "no recent health check"
+        return {
+            "status": "connected" if self.ready else "unavailable",
+            "latencyMs": self.latency_ms,
+            "checkedAt": self.checked_at_iso,
+            "error": error,
+            "checks": self.checks,
+            "failures": self.failures,
+        }
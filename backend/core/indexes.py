@@ -0,0 +1,129 @@
+# Index declarations for every query shape the API issues
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+
+class IndexSpec:
+    """An index a collection needs, named so re-creation is a no-op"""
+
+    def __init__(self, collection: str, keys: List[Tuple[str, int]], unique: bool = False):
+        self.collection = collection
+        self.keys = keys
+        self.unique = unique
+        self.name = "_".join(f"{field}_{direction}" for field, direction in keys)
+
+    def to_model(self) -> IndexModel:
+        return IndexModel(self.keys, name=self.name, unique=self.unique)
+
+
+class QueryShape:
+    """A query an endpoint runs, used to verify it is served by an index"""
+
+    def __init__(
+        self,
+        route: str,
+        collection: str,
+        query: Dict[str, Any],
+        sort: Optional[List[Tuple[str, int]]] = None
+    ):
+        self.route = route
+        self.collection = collection
+        self.query = query
+        self.sort = sort
+
+    def describe(self) -> str:
+        return f"{self.route}: {self.collection}.find({self.query}).sort({self.sort})"
+
+
+# Unique key indexes also back the upserts done by seeding and make
+# replayed contact writes idempotent
+INDEXES: List[IndexSpec] = [
+    IndexSpec("profile", [("id", ASCENDING)], unique=True),
+    IndexSpec("skills", [("name", ASCENDING)], unique=True),
+    IndexSpec("experience", [("id", ASCENDING)], unique=True),
+    IndexSpec("experience", [("duration", DESCENDING)]),
+    IndexSpec("projects", [("id", ASCENDING)], unique=True),
+    IndexSpec("projects", [("category", ASCENDING)]),
+    IndexSpec("testimonials", [("id", ASCENDING)], unique=True),
+    IndexSpec("testimonials", [("approved", ASCENDING), ("id", ASCENDING)]),
+    IndexSpec("certifications", [("id", ASCENDING)], unique=True),
+    IndexSpec("certifications", [("date", DESCENDING), ("id", ASCENDING)]),
+    IndexSpec("awards", [("id", ASCENDING)], unique=True),
+    IndexSpec("awards", [("year", DESCENDING), ("id", ASCENDING)]),
+    IndexSpec("contacts", [("id", ASCENDING)], unique=True),
+    IndexSpec("contacts", [("status", ASCENDING)]),
+]
+
+# Unfiltered, unsorted reads (e.g. all skills) are full reads by design and
+# are not listed here
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("/api/profile", "profile", {"id": "__probe__"}),
+    QueryShape("/api/experience", "experience", {}, [("duration", DESCENDING)]),
+    QueryShape("/api/projects", "projects", {"category": "__probe__"}),
+    QueryShape("/api/testimonials", "testimonials", {"approved": True}),
+    QueryShape("/api/certifications", "certifications", {}, [("date", DESCENDING)]),
+    QueryShape("/api/awards", "awards", {}, [("year", DESCENDING)]),
+    QueryShape("/api/stats", "contacts", {"status": "new"}),
+    # Keyset pagination (limit/cursor)
+    QueryShape("/api/projects?limit", "projects", {"id": {"$gt": ""}}, [("id", ASCENDING)]),
+    QueryShape("/api/testimonials?limit", "testimonials", {"approved": True}, [("id", ASCENDING)]),
+    QueryShape("/api/certifications?limit", "certifications", {}, [("date", DESCENDING), ("id", ASCENDING)]),
+    QueryShape("/api/awards?limit", "awards", {}, [("year", DESCENDING), ("id", ASCENDING)]),
+]
+
+
+async def ensure_indexes(db, indexes: List[IndexSpec] = INDEXES) -> None:
+    """Create every declared index; existing identical indexes are left alone"""
+    by_collection: Dict[str, List[IndexModel]] = {}
+    for spec in indexes:
+        by_collection.setdefault(spec.collection, []).append(spec.to_model())
+
+    await asyncio.gather(*(
+        db[collection].create_indexes(models)
+        for collection, models in by_collection.items()
+    ))
+
+
+def _has_collection_scan(plan: Any) -> bool:
+    """Walk an explain() plan tree looking for a COLLSCAN stage"""
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_has_collection_scan(value) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_has_collection_scan(item) for item in plan)
+    return False
+
+
+async def find_unindexed_queries(db, shapes: List[QueryShape] = QUERY_SHAPES) -> List[QueryShape]:
+    """Explain every declared query shape and return those planned as collection scans"""
+    async def explain(shape: QueryShape) -> Dict[str, Any]:
+        cursor = db[shape.collection].find(shape.query)
+        if shape.sort:
+            cursor = cursor.sort(shape.sort)
+        return await cursor.explain()
+
+    plans = await asyncio.gather(*(explain(shape) for shape in shapes))
+    return [
+        shape for shape, plan in zip(shapes, plans)
+        if _has_collection_scan(plan.get("queryPlanner", {}).get("winningPlan"))
+    ]
+
+
+async def report_unindexed_queries(db) -> None:
+    """Log a warning for each declared query that would run without an index"""
+    try:
+        unindexed = await find_unindexed_queries(db)
+    except Exception as e:
+        logger.warning(f"Skipping index explain() check: {e}")
+        return
+
+    for shape in unindexed:
+        logger.warning(f"Query runs without an index (COLLSCAN): {shape.describe()}")
+    if not unindexed:
+        logger.info(f"All {len(QUERY_SHAPES)} declared query shapes use an index")
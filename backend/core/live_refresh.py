@@ -0,0 +1,117 @@
+# Keeps cached content current by following MongoDB change streams
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Set
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from core.tasks import cancel_and_wait
+
+logger = logging.getLogger(__name__)
+
+# How long each change stream getMore waits for events. It also bounds how
+# long a burst of writes (e.g. a reseed) is coalesced before one reload per
+# collection, keeping edits visible well within a second.
+MAX_AWAIT_MS = 250
+RETRY_DELAY_SECONDS = 1.0
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class ContentWatcher:
+    """Background task that reloads cached content when it changes.
+
+    Each worker process runs its own watcher. It follows a change stream on
+    the content collections and refreshes the affected cache entries in
+    place. On deployments without change streams (standalone mongod) it
+    falls back to reloading the cached entries every ``poll_interval``
+    seconds, which swaps in new data only when it actually changed.
+    """
+
+    def __init__(
+        self,
+        db,
+        cache,
+        collections: List[str],
+        poll_interval: float = 1.0,
+        on_change: Optional[Callable[[Set[str]], Awaitable[None]]] = None
+    ):
+        self.db = db
+        self.cache = cache
+        self.collections = list(collections)
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+        self.mode = "stopped"
+        self._task: Optional[asyncio.Task] = None
+        self._resume_token = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        await cancel_and_wait(self._task)
+        self._task = None
+        self.mode = "stopped"
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._watch()
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    # Resume point fell off the oplog; start from now
+                    self._resume_token = None
+                    continue
+                # Change streams need a replica set or sharded cluster
+                logger.info(f"Change streams unavailable ({e}), polling every {self.poll_interval}s")
+                break
+            except PyMongoError as e:
+                logger.warning(f"Change stream interrupted, resuming: {e}")
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+            except Exception as e:
+                logger.info(f"Change streams unsupported ({e}), polling every {self.poll_interval}s")
+                break
+        await self._poll()
+
+    async def _watch(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": self.collections}}}]
+        async with self.db.watch(
+            pipeline,
+            resume_after=self._resume_token,
+            max_await_time_ms=MAX_AWAIT_MS
+        ) as stream:
+            self.mode = "change_stream"
+            logger.info("Watching content collections for changes")
+            while True:
+                change = await stream.next()
+                changed = {change["ns"]["coll"]}
+                self._resume_token = stream.resume_token
+
+                # Coalesce a burst of events into one refresh per collection;
+                # try_next returns None once the stream is idle for the await time
+                change = await stream.try_next()
+                while change is not None:
+                    changed.add(change["ns"]["coll"])
+                    self._resume_token = stream.resume_token
+                    change = await stream.try_next()
+
+                # Events name the written collections even when this worker
+                # has nothing cached for them, so report them all
+                await self._refresh(changed, written=changed)
+
+    async def _poll(self) -> None:
+        self.mode = "polling"
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self._refresh(set(self.collections))
+
+    async def _refresh(self, collections: Set[str], written: Optional[Set[str]] = None) -> None:
+        try:
+            changed = await self.cache.refresh(*collections) | (written or set())
+            if changed and self.on_change:
+                await self.on_change(changed)
+        except Exception as e:
+            logger.warning(f"Failed to refresh content after change: {e}")
@@ -0,0 +1,224 @@
+# Structured JSON logging off the event loop, with per-request context
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+REQUEST_ID_HEADER = "x-request-id"
+
+access_logger = logging.getLogger("access")
+
+
+class RequestContext:
+    """Per-request state shared with every log record and database call.
+
+    The context variable holds this mutable object rather than plain
+    values, so time recorded inside tasks spawned by the request (e.g. by
+    ``asyncio.gather``) is added to the same totals.
+    """
+
+    __slots__ = ("request_id", "route", "timings", "mongo_operations")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.route: Optional[str] = None
+        # Stage name -> seconds spent in it (e.g. mongo, validate, encode)
+        self.timings: Dict[str, float] = {}
+        self.mongo_operations = 0
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+
+request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+
+@contextmanager
+def stage(name: str):
+    """Add the time spent in the wrapped block to a stage of the current request"""
+    context = request_context.get()
+    if context is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        context.add_time(name, time.perf_counter() - started)
+
+
+@contextmanager
+def mongo_timer():
+    """Add the time spent in the wrapped database await to the current request.
+
+    Motor runs operations on executor threads that do not see the request's
+    context, so the await is timed here on the event loop instead. Calls
+    that run concurrently are summed.
+    """
+    context = request_context.get()
+    try:
+        with stage("mongo"):
+            yield
+    finally:
+        if context is not None:
+            context.mongo_operations += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with request context and ``extra`` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["requestId"] = request_id
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ContextQueueHandler(QueueHandler):
+    """Hands records to the listener thread with request context attached.
+
+    Runs in the thread that logs, so it only captures state; formatting and
+    the write to stderr happen on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        context = request_context.get()
+        if context is not None and not hasattr(record, "request_id"):
+            record.request_id = context.request_id
+        # Resolve everything that may not survive the trip to another thread
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: str = "INFO", format: str = "json") -> None:
+    """Route every log record through a queue to a background writer thread.
+
+    Safe to call more than once (e.g. once per app instance); later calls
+    only change the level.
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    if format == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s",
+            defaults={"request_id": "-"}
+        ))
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(ContextQueueHandler(records))
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+class AccessLogMiddleware:
+    """ASGI middleware assigning request IDs and writing sampled access logs.
+
+    The request ID comes from the ``X-Request-ID`` header when the caller
+    sends one and is echoed back on the response. Server errors are always
+    logged; other requests are logged with probability ``sample_rate``.
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _header(scope, REQUEST_ID_HEADER) or uuid.uuid4().hex
+        context = RequestContext(request_id)
+        token = request_context.set(context)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (REQUEST_ID_HEADER.encode(), request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            context.route = getattr(route, "path", None)
+            if status >= 500 or random.random() < self.sample_rate:
+                self._log(scope, context, status, time.perf_counter() - started)
+            request_context.reset(token)
+
+    def _log(self, scope, context: RequestContext, status: int, duration: float) -> None:
+        access_logger.log(
+            logging.ERROR if status >= 500 else logging.INFO,
+            f"{scope['method']} {scope['path']} {status}",
+            extra={"fields": {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": context.route,
+                "status": status,
+                "durationMs": round(duration * 1000, 3),
+                "mongoMs": round(context.timings.get("mongo", 0.0) * 1000, 3),
+                "mongoOperations": context.mongo_operations,
+                "stagesMs": {
+                    name: round(seconds * 1000, 3)
+                    for name, seconds in context.timings.items()
+                },
+            }}
+        )
+
+
+def _header(scope, name: str) -> Optional[str]:
+    encoded = name.encode()
+    for key, value in scope.get("headers", ()):
+        if key.lower() == encoded:
+            return value.decode("latin-1")[:128]
+    return None
@@ -0,0 +1,246 @@
+# Request and MongoDB command instrumentation in Prometheus text format
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+from pymongo import monitoring
+from starlette.routing import Match
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; fine-grained at the low end where cached routes land
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Label used for requests that matched no route, so unknown paths
+# cannot grow the number of series without bound
+UNMATCHED_ROUTE = "unmatched"
+
+# Resolved (method, path) -> route template lookups kept per middleware
+MAX_CACHED_ROUTE_LOOKUPS = 1024
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def samples(self, name: str, labels: Labels) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(_sample(f"{name}_bucket", labels + (("le", _number(bound)),), cumulative))
+        lines.append(_sample(f"{name}_bucket", labels + (("le", "+Inf"),), self.count))
+        lines.append(_sample(f"{name}_sum", labels, self.total))
+        lines.append(_sample(f"{name}_count", labels, self.count))
+        return lines
+
+
+class RequestMetrics:
+    """Per-route request counts, status codes, latencies and in-flight requests.
+
+    Updated from the event loop only, so no locking is needed.
+    """
+
+    def __init__(self):
+        self.requests: Dict[Labels, int] = {}
+        self.latency: Dict[Labels, Histogram] = {}
+        self.in_flight: Dict[Labels, int] = {}
+
+    def started(self, method: str, route: str) -> None:
+        key = (("method", method), ("route", route))
+        self.in_flight[key] = self.in_flight.get(key, 0) + 1
+
+    def finished(self, method: str, route: str, status: int, duration: float) -> None:
+        route_labels = (("method", method), ("route", route))
+        self.in_flight[route_labels] -= 1
+
+        status_labels = route_labels + (("status", str(status)),)
+        self.requests[status_labels] = self.requests.get(status_labels, 0) + 1
+        histogram = self.latency.get(route_labels)
+        if histogram is None:
+            histogram = self.latency[route_labels] = Histogram()
+        histogram.observe(duration)
+
+    def render(self) -> List[str]:
+        lines = _family(
+            "http_requests_total", "counter",
+            "HTTP requests by method, route and status code",
+            (_sample("http_requests_total", labels, value)
+             for labels, value in sorted(self.requests.items()))
+        )
+        lines += _family(
+            "http_request_duration_seconds", "histogram",
+            "HTTP request latency by method and route",
+            (line for labels, histogram in sorted(self.latency.items())
+             for line in histogram.samples("http_request_duration_seconds", labels))
+        )
+        lines += _family(
+            "http_requests_in_flight", "gauge",
+            "HTTP requests currently being served, by method and route",
+            (_sample("http_requests_in_flight", labels, value)
+             for labels, value in sorted(self.in_flight.items()))
+        )
+        return lines
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request until its body is sent.
+
+    Requests are labelled with the matched route's path template (e.g.
+    ``/api/projects``) rather than the raw URL. The route is resolved
+    against ``routes`` before the request is handled, so the in-flight
+    gauge is per route too.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics, routes: Iterable = ()):
+        self.app = app
+        self.metrics = metrics
+        self.routes = routes
+        self._route_paths: Dict[Tuple[str, str], str] = {}
+
+    def route_path(self, scope) -> str:
+        """Path template of the route that will handle this request"""
+        key = (scope["method"], scope["path"])
+        path = self._route_paths.get(key)
+        if path is not None:
+            return path
+
+        path = UNMATCHED_ROUTE
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                path = getattr(route, "path", UNMATCHED_ROUTE)
+                break
+        if len(self._route_paths) < MAX_CACHED_ROUTE_LOOKUPS:
+            self._route_paths[key] = path
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.route_path(scope)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.started(method, route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.finished(method, route, status, time.perf_counter() - started)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Times every MongoDB command sent by one client.
+
+    PyMongo calls these hooks from the threads Motor runs operations on,
+    so updates are guarded by a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Labels, Histogram] = {}
+        self.failures: Dict[Labels, int] = {}
+
+    def _observe(self, event, failed: bool) -> None:
+        labels = (("command", event.command_name),)
+        duration = event.duration_micros / 1_000_000
+        with self._lock:
+            histogram = self.latency.get(labels)
+            if histogram is None:
+                histogram = self.latency[labels] = Histogram()
+            histogram.observe(duration)
+            if failed:
+                self.failures[labels] = self.failures.get(labels, 0) + 1
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._observe(event, failed=False)
+
+    def failed(self, event):
+        self._observe(event, failed=True)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            lines = _family(
+                "mongodb_command_duration_seconds", "histogram",
+                "MongoDB command round-trip time by command name",
+                (line for labels, histogram in sorted(self.latency.items())
+                 for line in histogram.samples("mongodb_command_duration_seconds", labels))
+            )
+            lines += _family(
+                "mongodb_command_failures_total", "counter",
+                "MongoDB commands that returned an error",
+                (_sample("mongodb_command_failures_total", labels, value)
+                 for labels, value in sorted(self.failures.items()))
+            )
+        return lines
+
+
+def render_gauges(prefix: str, values: Dict[str, float], help_text: str) -> List[str]:
+    """Expose a flat dict of numbers (e.g. pool or cache stats) as gauges"""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{_snake_case(key)}"
+        lines += _family(name, "gauge", f"{help_text}: {key}", [_sample(name, (), value)])
+    return lines
+
+
+def render_text(lines: Iterable[str]) -> str:
+    return "\n".join(lines) + "\n"
+
+
+def _family(name: str, kind: str, help_text: str, samples: Iterable[str]) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *samples]
+
+
+def _sample(name: str, labels: Labels, value: float) -> str:
+    if not labels:
+        return f"{name} {_number(value)}"
+    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+    return f"{name}{{{rendered}}} {_number(value)}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _snake_case(name: str) -> str:
+    return "".join(f"_{char.lower()}" if char.isupper() else char for char in name)
+
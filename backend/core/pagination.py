@@ -0,0 +1,154 @@
+# Keyset pagination, field projection and NDJSON helpers for list endpoints
+import base64
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Type
+
+from pymongo import ASCENDING, DESCENDING
+
+from core.responses import encode_json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+Document = Dict[str, Any]
+
+
+class InvalidQuery(ValueError):
+    """Raised for malformed cursors or unknown projection fields"""
+
+
+def encode_cursor(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise InvalidQuery("Malformed cursor")
+    if not isinstance(values, list):
+        raise InvalidQuery("Malformed cursor")
+    return values
+
+
+class KeysetSpec:
+    """Sort order used to page a collection, made total by a unique tiebreaker.
+
+    The cursor encodes the sort values of the last document returned, so
+    the next page is an index range query instead of a skip. Cursor values
+    must have the key's type (``field_type``; the tiebreaker is a string).
+    """
+
+    def __init__(
+        self,
+        field: str = "id",
+        direction: int = ASCENDING,
+        tiebreaker: str = "id",
+        field_type: Type = str
+    ):
+        self.keys: List[Tuple[str, int]] = [(field, direction)]
+        self.types: List[Type] = [field_type]
+        if field != tiebreaker:
+            self.keys.append((tiebreaker, ASCENDING))
+            self.types.append(str)
+
+    @property
+    def fields(self) -> List[str]:
+        return [field for field, _ in self.keys]
+
+    def sort(self) -> List[Tuple[str, int]]:
+        return list(self.keys)
+
+    def cursor_for(self, document: Document) -> str:
+        return encode_cursor([document.get(field) for field in self.fields])
+
+    def values(self, cursor: str) -> List[Any]:
+        """Decode a cursor, rejecting values that cannot be compared with the keys"""
+        values = decode_cursor(cursor)
+        if len(values) != len(self.keys) or not all(
+            isinstance(value, expected) and not isinstance(value, bool)
+            for value, expected in zip(values, self.types)
+        ):
+            raise InvalidQuery("Cursor does not match this collection")
+        return values
+
+    def after(self, cursor: str) -> Dict[str, Any]:
+        """Mongo filter matching documents that sort after the cursor"""
+        values = self.values(cursor)
+
+        clauses = []
+        for i, (field, direction) in enumerate(self.keys):
+            clause = {f: v for (f, _), v in zip(self.keys[:i], values[:i])}
+            clause[field] = {"$gt" if direction == ASCENDING else "$lt": values[i]}
+            clauses.append(clause)
+        return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+    def order(self, documents: Iterable[Document]) -> List[Document]:
+        """Sort in memory exactly as the Mongo sort would"""
+        ordered = list(documents)
+        for field, direction in reversed(self.keys):
+            ordered.sort(key=lambda doc: doc.get(field), reverse=direction == DESCENDING)
+        return ordered
+
+    def is_after(self, document: Document, values: List[Any]) -> bool:
+        for (field, direction), value in zip(self.keys, values):
+            current = document.get(field)
+            if current != value:
+                return current > value if direction == ASCENDING else current < value
+        return False
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """Parse a comma separated ``fields=`` selector, rejecting unknown names"""
+    if not fields:
+        return None
+    selected = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in set(allowed)]
+    if unknown:
+        raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+
+def project(document: Document, projection: Dict[str, int]) -> Document:
+    """Apply an inclusion projection in memory"""
+    included = [field for field, flag in projection.items() if flag and field != "_id"]
+    if not included:
+        return document
+    return {field: document[field] for field in included if field in document}
+
+
+def page_in_memory(
+    documents: List[Document],
+    spec: KeysetSpec,
+    cursor: Optional[str],
+    limit: Optional[int]
+) -> Tuple[List[Document], Optional[str]]:
+    """Page a list of documents the same way the Mongo path does"""
+    ordered = spec.order(documents)
+    if cursor:
+        values = spec.values(cursor)
+        ordered = [doc for doc in ordered if spec.is_after(doc, values)]
+    if limit is None or len(ordered) <= limit:
+        return ordered, None
+    page = ordered[:limit]
+    return page, spec.cursor_for(page[-1])
+
+
+async def iterate(documents: Iterable[Document]) -> AsyncIterator[Document]:
+    """Adapt an in-memory list to the async iteration a Motor cursor offers"""
+    for document in documents:
+        yield document
+
+
+async def ndjson_lines(
+    documents: AsyncIterator[Document],
+    projection: Optional[Dict[str, int]] = None
+) -> AsyncIterator[bytes]:
+    """Encode documents one per line as they arrive, optionally projected"""
+    async for document in documents:
+        if projection:
+            document = project(document, projection)
+        yield encode_json(document) + b"\n"
@@ -0,0 +1,97 @@
+# Connection pool metrics collected from PyMongo's CMAP events
+import threading
+import time
+from typing import Any, Dict
+
+from pymongo import monitoring
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Tracks connection usage across every server pool of one client.
+
+    PyMongo calls these hooks from the threads Motor runs operations on, so
+    counters are guarded by a lock. A checkout starts and ends on the same
+    thread, which is how the wait time is measured.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.wait_queue_depth = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.pool_clears = 0
+
+    def _end_wait(self) -> float:
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        return time.perf_counter() - started if started is not None else 0.0
+
+    # Pool lifecycle
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    # Connection lifecycle
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    # Checkout
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+        with self._lock:
+            self.wait_queue_depth += 1
+
+    def connection_check_out_failed(self, event):
+        self._end_wait()
+        with self._lock:
+            self.wait_queue_depth -= 1
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        waited = self._end_wait()
+        with self._lock:
+            self.wait_queue_depth -= 1
+            self.checked_out += 1
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            average_wait = self.wait_time_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "openConnections": self.open_connections,
+                "checkedOut": self.checked_out,
+                "waitQueueDepth": self.wait_queue_depth,
+                "checkouts": self.checkouts,
+                "checkoutFailures": self.checkout_failures,
+                "avgWaitMs": round(average_wait * 1000, 3),
+                "maxWaitMs": round(self.wait_time_max * 1000, 3),
+                "poolClears": self.pool_clears,
+            }
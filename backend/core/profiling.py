@@ -0,0 +1,129 @@
+# Opt-in per-request profiling and Server-Timing breakdowns
+import asyncio
+import cProfile
+import hmac
+import logging
+import os
+import re
+import time
+from typing import Optional
+
+from core.logs import request_context
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+ADMIN_KEY_HEADER = b"x-admin-key"
+PROFILE_QUERY_FLAG = re.compile(r"(^|&)profile=(1|true)(&|$)")
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+MAX_FILENAME_PART = 64
+
+
+def _safe_filename(value: str) -> str:
+    return _UNSAFE_FILENAME.sub("_", value)[:MAX_FILENAME_PART].strip(".")
+
+
+def server_timing(timings, total: float) -> str:
+    """Server-Timing header value: each recorded stage plus the total, in ms"""
+    entries = [
+        f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items()
+    ]
+    entries.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(entries)
+
+
+class ProfilingMiddleware:
+    """Adds Server-Timing to responses and profiles requests on demand.
+
+    A request is profiled when it sends ``X-Profile: 1`` (or ``?profile=1``)
+    together with ``X-Admin-Key`` matching ``admin_key``; without a
+    configured key profiling is disabled. The request runs under cProfile
+    and the stats are written to ``profile_dir`` as a ``.pstats`` file
+    (open with ``python -m pstats`` or snakeviz), named in the
+    ``X-Profile-File`` response header.
+
+    cProfile sees everything the event loop runs meanwhile, so profiles
+    are cleanest on an instance with little other traffic. Only one
+    request is profiled at a time; overlapping requests run normally.
+    """
+
+    def __init__(
+        self,
+        app,
+        admin_key: Optional[str] = None,
+        profile_dir: str = "profiles",
+        server_timing: bool = True
+    ):
+        self.app = app
+        self.admin_key = admin_key
+        self.profile_dir = profile_dir
+        self.server_timing = server_timing
+        self._profiling = False
+
+    def _wants_profile(self, scope) -> bool:
+        if not self.admin_key or self._profiling:
+            return False
+        headers = dict(scope.get("headers", ()))
+        requested = (
+            headers.get(PROFILE_HEADER, b"").lower() in (b"1", b"true")
+            or PROFILE_QUERY_FLAG.search(scope.get("query_string", b"").decode("latin-1"))
+        )
+        if not requested:
+            return False
+        return hmac.compare_digest(
+            headers.get(ADMIN_KEY_HEADER, b""), self.admin_key.encode()
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler = None
+        profile_path = None
+        if self._wants_profile(scope):
+            context = request_context.get()
+            request_id = context.request_id if context else str(int(time.time() * 1000))
+            # Both parts come from the client, so keep them to one short path segment
+            name = _safe_filename(scope["path"].strip("/")) or "root"
+            request_id = _safe_filename(request_id) or "request"
+            profile_path = os.path.join(
+                self.profile_dir, f"{time.strftime('%Y%m%dT%H%M%S')}-{name}-{request_id}.pstats"
+            )
+            profiler = cProfile.Profile()
+
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                context = request_context.get()
+                if self.server_timing and context is not None:
+                    value = server_timing(context.timings, time.perf_counter() - started)
+                    headers.append((b"server-timing", value.encode()))
+                if profile_path:
+                    headers.append((b"x-profile-file", os.path.basename(profile_path).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        if profiler is None:
+            await self.app(scope, receive, send_wrapper)
+            return
+
+        self._profiling = True
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self._profiling = False
+            try:
+                await asyncio.to_thread(self._dump, profiler, profile_path)
+            except Exception as e:
+                logger.warning(f"Failed to write profile {profile_path}: {e}")
+
+    def _dump(self, profiler: cProfile.Profile, path: str) -> None:
+        os.makedirs(self.profile_dir, exist_ok=True)
+        profiler.dump_stats(path)
+        logger.info(f"Wrote request profile to {path}")
@@ -0,0 +1,119 @@
+# Shared data-access layer for portfolio content reads
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from pymongo.read_preferences import (
+    Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+)
+
+from core.breaker import CircuitBreaker
+from core.logs import mongo_timer
+
+Document = Dict[str, Any]
+
+READ_PREFERENCE_MODES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def build_read_preference(mode: str, max_staleness_seconds: int = -1):
+    """Read preference for a mode name; max staleness is ignored for primary.
+
+    MongoDB requires maxStalenessSeconds to be at least 90 (or -1 for no limit).
+    """
+    if mode not in READ_PREFERENCE_MODES:
+        raise ValueError(f"Unknown read preference: {mode}")
+    if mode == "primary":
+        return Primary()
+    return READ_PREFERENCE_MODES[mode](max_staleness=max_staleness_seconds)
+
+
+class QuerySpec:
+    """How an endpoint reads a collection.
+
+    The projection always excludes ``_id`` and includes exactly the fields of
+    the response model, so documents leave the driver in their final shape
+    and never need per-document cleanup in Python.
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        model: Type[BaseModel],
+        query: Optional[Dict[str, Any]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None
+    ):
+        self.collection = collection
+        self.model = model
+        self.query = query or {}
+        self.sort = sort
+        self.fields = list(model.model_fields)
+        self._projection = {"_id": 0, **{field: 1 for field in self.fields}}
+
+    def projection(self, fields: Optional[List[str]] = None) -> Dict[str, int]:
+        """Projection for the model's fields, or for a narrower selection"""
+        if not fields:
+            return self._projection
+        return {"_id": 0, **{field: 1 for field in fields}}
+
+
+class ContentRepository:
+    """Runs declared queries against the database.
+
+    Content tolerates a little staleness, so every read made through the
+    repository uses ``read_preference`` (secondaries by default) and scales
+    with replicas. Writes, counters and health checks use the database
+    handle directly and therefore stay on the primary. Reads go through
+    ``breaker`` when one is given.
+    """
+
+    def __init__(self, db, read_preference=None, breaker: Optional[CircuitBreaker] = None):
+        self.db = db
+        self.read_preference = read_preference or Primary()
+        self.breaker = breaker
+        self._collections: Dict[str, Any] = {}
+
+    def collection(self, spec: QuerySpec):
+        collection = self._collections.get(spec.collection)
+        if collection is None:
+            collection = self.db.get_collection(
+                spec.collection, read_preference=self.read_preference
+            )
+            self._collections[spec.collection] = collection
+        return collection
+
+    def cursor(
+        self,
+        spec: QuerySpec,
+        query: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None
+    ):
+        """Cursor over the spec's documents, with extra filters or a narrower projection"""
+        cursor = self.collection(spec).find(
+            {**spec.query, **(query or {})}, spec.projection(fields)
+        )
+        sort = sort or spec.sort
+        if sort:
+            cursor = cursor.sort(sort)
+        return cursor
+
+    async def run(self, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """Await a database operation through the circuit breaker"""
+        if self.breaker is None:
+            return await operation()
+        return await self.breaker.call(operation)
+
+    async def find_all(self, spec: QuerySpec, query: Optional[Dict[str, Any]] = None) -> List[Document]:
+        with mongo_timer():
+            return await self.run(lambda: self.cursor(spec, query).to_list(length=None))
+
+    async def find_one(self, spec: QuerySpec, query: Optional[Dict[str, Any]] = None) -> Optional[Document]:
+        with mongo_timer():
+            return await self.run(lambda: self.collection(spec).find_one(
+                {**spec.query, **(query or {})}, spec.projection()
+            ))
@@ -0,0 +1,126 @@
+# Resources owned by one application instance for its lifetime
+import logging
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from core.breaker import CircuitBreaker
+from core.cache import CollectionCache
+from core.contact_queue import ContactWriteQueue
+from core.health import HealthMonitor
+from core.live_refresh import ContentWatcher
+from core.metrics import CommandMetrics
+from core.pool_metrics import PoolMetrics
+from core.repository import ContentRepository, build_read_preference
+from core.responses import RenderedCache
+from core.serialization import Serializer, parse_overrides
+from core.settings import Settings
+from core.singleflight import SingleFlight
+from core.snapshot import ContactStore, SnapshotContent
+from core.stats import StatsEngine
+
+logger = logging.getLogger(__name__)
+
+
+class AppResources:
+    """Container for the database client, caches, queues and workers.
+
+    One instance is created per application by its lifespan and reached
+    from handlers through the ``get_resources`` dependency, so several
+    apps can run side by side in one process without sharing state.
+    """
+
+    def __init__(self, settings: Settings, snapshot: Optional[SnapshotContent] = None):
+        self.settings = settings
+        self.snapshot = snapshot
+        self.cache = CollectionCache(
+            ttl_seconds=settings.content_cache_ttl_seconds,
+            max_entries=settings.content_cache_max_entries
+        )
+        self.serializer = Serializer(
+            settings.serializer, parse_overrides(settings.route_serializers)
+        )
+        self.rendered = RenderedCache(compress=settings.response_compression)
+        # Uncached reads (stats, pages) share identical in-flight queries
+        self.flights = SingleFlight()
+        self.breaker = CircuitBreaker(
+            "mongodb",
+            failure_rate=settings.breaker_failure_rate,
+            window_size=settings.breaker_window_size,
+            min_calls=settings.breaker_min_calls,
+            reset_timeout=settings.breaker_reset_seconds,
+            call_timeout=settings.database_call_timeout_seconds or None
+        )
+        self.pool_metrics = PoolMetrics()
+        self.command_metrics = CommandMetrics()
+
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.db = None
+        self.repository: Optional[ContentRepository] = None
+        # Reads that must see the latest writes (cache refreshes, and misses
+        # shortly after this process wrote a collection) use the primary
+        self.primary_repository: Optional[ContentRepository] = None
+        self._recent_writes: Dict[str, float] = {}
+        self.stats = None
+        self.contact_store: Optional[ContactStore] = None
+        self.contact_queue: Optional[ContactWriteQueue] = None
+        self.watcher: Optional[ContentWatcher] = None
+        self.health: Optional[HealthMonitor] = None
+
+    @property
+    def snapshot_mode(self) -> bool:
+        return self.snapshot is not None
+
+    def connect(self) -> None:
+        """Create the Motor client and the handles built on it"""
+        settings = self.settings
+        self.client = AsyncIOMotorClient(
+            settings.mongo_url,
+            event_listeners=[self.pool_metrics, self.command_metrics],
+            **settings.mongo_client_options()
+        )
+        self.db = self.client[settings.database_name]
+        self.repository = ContentRepository(self.db, build_read_preference(
+            settings.content_read_preference,
+            settings.content_max_staleness_seconds
+        ), breaker=self.breaker)
+        self.primary_repository = ContentRepository(self.db, breaker=self.breaker)
+        self.stats = StatsEngine(self.db, breaker=self.breaker)
+
+    def mark_written(self, *collections: str) -> None:
+        """Read these collections from the primary until secondaries catch up"""
+        until = time.monotonic() + self.settings.content_max_staleness_seconds
+        for collection in collections:
+            self._recent_writes[collection] = until
+
+    def repository_for(self, collection: str) -> ContentRepository:
+        """The repository a read of ``collection`` should use right now"""
+        if self._recent_writes.get(collection, 0.0) > time.monotonic():
+            return self.primary_repository
+        return self.repository
+
+    async def aclose(self) -> None:
+        """Stop background work, flush queued writes, then close the client"""
+        if self.health:
+            await self.health.stop()
+            self.health = None
+        if self.watcher:
+            await self.watcher.stop()
+            self.watcher = None
+        if self.contact_queue:
+            await self.contact_queue.stop()
+            self.contact_queue = None
+        if self.client:
+            self.client.close()
+            self.client = None
+            logger.info("MongoDB connection closed")
+
+
+async def get_resources(request: Request) -> AppResources:
+    """FastAPI dependency returning the resources of the serving app.
+
+    Async so FastAPI calls it on the event loop instead of a worker thread.
+    """
+    return request.app.state.resources
@@ -0,0 +1,186 @@
+# Pre-serialized JSON responses with strong ETags and pre-compressed variants
+import gzip
+import hashlib
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is still offered
+    brotli = None
+
+# Clients may reuse the body but must revalidate it with If-None-Match
+CACHE_CONTROL = "no-cache"
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 512
+
+# Encodings we can produce, most preferred first
+SUPPORTED_ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def to_jsonable(payload: Any) -> Any:
+    """Convert models (or lists of models) into plain JSON-ready data"""
+    if isinstance(payload, BaseModel):
+        return payload.model_dump(mode="json")
+    if isinstance(payload, (list, tuple)):
+        return [to_jsonable(item) for item in payload]
+    return payload
+
+
+def encode_json(payload: Any) -> bytes:
+    """Encode a payload as compact UTF-8 JSON"""
+    return json.dumps(
+        to_jsonable(payload), separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes"""
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def parse_if_none_match(header: str) -> List[str]:
+    """Split an If-None-Match header into opaque tags (weak prefixes dropped)"""
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress at the highest level; variants are built once per content version"""
+    if encoding == "br":
+        return brotli.compress(body, quality=11)
+    # mtime=0 keeps the output (and so its ETag) identical across processes
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header, or None"""
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            qualities[coding.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class RenderedContent:
+    """Final JSON bytes for a route together with their ETag.
+
+    Built once per content version; serving it involves no model
+    construction or JSON encoding. Compressed variants are built once per
+    version too (``precompress``), each with its own ETag, and chosen per
+    request from Accept-Encoding.
+    """
+
+    __slots__ = ("body", "etag", "variants", "compressed")
+
+    def __init__(self, body: bytes, etag: Optional[str] = None):
+        self.body = body
+        self.etag = etag or compute_etag(body)
+        # Encoding -> (compressed body, ETag of that representation)
+        self.variants: Dict[str, Tuple[bytes, str]] = {}
+        self.compressed = False
+
+    def precompress(self) -> "RenderedContent":
+        """Build every compressed variant that is smaller than the body"""
+        if self.compressed:
+            return self
+        self.compressed = True
+        if len(self.body) < MIN_COMPRESS_BYTES:
+            return self
+        for encoding in SUPPORTED_ENCODINGS:
+            compressed = compress(self.body, encoding)
+            if len(compressed) < len(self.body):
+                self.variants[encoding] = (compressed, f'{self.etag[:-1]}-{encoding}"')
+        return self
+
+    @classmethod
+    def render(cls, payload: Any) -> "RenderedContent":
+        return cls(encode_json(payload))
+
+    def matches(self, tags: Iterable[str]) -> bool:
+        """Weak comparison as required for If-None-Match (RFC 9110)"""
+        known = {self.etag, *(etag for _, etag in self.variants.values())}
+        return any(tag == "*" or tag in known for tag in tags)
+
+    def respond(self, request: Request) -> Response:
+        """Return 304 when the client already holds this version, else the bytes.
+
+        Uses a pre-built compressed variant when the client accepts one.
+        Any representation's ETag revalidates, since they share content.
+        """
+        body, etag = self.body, self.etag
+        headers = {"Cache-Control": CACHE_CONTROL}
+        if self.variants:
+            headers["Vary"] = "Accept-Encoding"
+            encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+            if encoding in self.variants:
+                body, etag = self.variants[encoding]
+                headers["Content-Encoding"] = encoding
+        headers["ETag"] = etag
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and self.matches(parse_if_none_match(if_none_match)):
+            headers.pop("Content-Encoding", None)
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+class RenderedCache:
+    """Bounded LRU of rendered bodies keyed by ETag (i.e. content version).
+
+    For responses assembled per request, such as the spliced portfolio:
+    the bytes are hashed on every request, but compressed only the first
+    time a version is seen.
+    """
+
+    def __init__(self, max_entries: int = 64, compress: bool = True):
+        self.max_entries = max_entries
+        self.compress = compress
+        self._entries: "OrderedDict[str, RenderedContent]" = OrderedDict()
+
+    def get(self, body: bytes) -> RenderedContent:
+        etag = compute_etag(body)
+        rendered = self._entries.get(etag)
+        if rendered is not None:
+            self._entries.move_to_end(etag)
+            return rendered
+
+        rendered = RenderedContent(body, etag)
+        if self.compress:
+            rendered.precompress()
+        self._entries[etag] = rendered
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return rendered
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,101 @@
+# Idempotent, content-versioned seeding of the portfolio collections
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import DeleteMany, ReplaceOne
+
+logger = logging.getLogger(__name__)
+
+SEED_VERSIONS_COLLECTION = "seed_versions"
+
+
+class SeedDataset:
+    """Default documents for one collection and the field that identifies them"""
+
+    def __init__(self, collection: str, documents: List[Dict[str, Any]], key: str = "id"):
+        self.collection = collection
+        self.documents = documents
+        self.key = key
+        self.content_hash = dataset_hash(documents)
+
+
+def dataset_hash(documents: List[Dict[str, Any]]) -> str:
+    """Stable hash of a dataset's content, independent of dict key order"""
+    encoded = json.dumps(documents, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SeedEngine:
+    """Brings collections in line with their default datasets.
+
+    Each dataset's content hash is stored in a metadata collection after a
+    successful sync, so unchanged datasets cost no writes and an edited
+    dataset is upserted on the next boot. A failed collection keeps its old
+    hash and is retried next time.
+
+    The keys seeded last time are stored with the hash, and only documents
+    whose key was dropped from the dataset are deleted; documents that
+    never came from a dataset (e.g. added by an admin) are left alone.
+    """
+
+    def __init__(self, db, versions_collection: str = SEED_VERSIONS_COLLECTION):
+        self.db = db
+        self.versions = db[versions_collection]
+
+    async def stored_versions(self) -> Dict[str, Dict[str, Any]]:
+        return {doc["_id"]: doc async for doc in self.versions.find()}
+
+    async def sync_dataset(self, dataset: SeedDataset, seeded_keys: Optional[List[Any]] = None) -> None:
+        """Upsert every default document and remove ones dropped since the last seed"""
+        keys = [doc[dataset.key] for doc in dataset.documents]
+        operations = [
+            ReplaceOne({dataset.key: doc[dataset.key]}, dict(doc), upsert=True)
+            for doc in dataset.documents
+        ]
+        current = set(keys)
+        dropped = [key for key in seeded_keys or [] if key not in current]
+        if dropped:
+            operations.append(DeleteMany({dataset.key: {"$in": dropped}}))
+
+        await self.db[dataset.collection].bulk_write(operations, ordered=False)
+        await self.versions.replace_one(
+            {"_id": dataset.collection},
+            {
+                "hash": dataset.content_hash,
+                "keys": keys,
+                "documents": len(dataset.documents),
+                "seededAt": datetime.now(timezone.utc).isoformat()
+            },
+            upsert=True
+        )
+
+    async def sync(self, datasets: List[SeedDataset]) -> List[str]:
+        """Sync every changed dataset concurrently.
+
+        Returns every collection that was written to, including ones whose
+        sync failed part way, so callers can invalidate anything derived
+        from them.
+        """
+        stored = await self.stored_versions()
+        changed = [
+            ds for ds in datasets
+            if stored.get(ds.collection, {}).get("hash") != ds.content_hash
+        ]
+        if not changed:
+            return []
+
+        results = await asyncio.gather(
+            *(self.sync_dataset(ds, stored.get(ds.collection, {}).get("keys")) for ds in changed),
+            return_exceptions=True
+        )
+
+        for dataset, result in zip(changed, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error seeding {dataset.collection}: {result}")
+            else:
+                logger.info(f"Seeded {dataset.collection} ({len(dataset.documents)} documents)")
+        return [ds.collection for ds in changed]
@@ -0,0 +1,98 @@
+# Single-pass validation and JSON encoding for API payloads
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+from core.responses import encode_json
+
+try:
+    import orjson
+except ImportError:  # optional; the standard library encoder is used instead
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+Model = TypeVar("Model", bound=BaseModel)
+
+# "pydantic": models are dumped straight to bytes by pydantic-core's
+#             serializer (no intermediate dicts); plain data uses orjson
+# "orjson":   everything goes through orjson (models via model_dump)
+# "json":     the standard library encoder (the original behaviour)
+ENGINES = ("pydantic", "orjson", "json")
+
+
+@lru_cache(maxsize=None)
+def type_adapter(annotation: Any) -> TypeAdapter:
+    """Build each TypeAdapter (and its compiled validator/serializer) once"""
+    return TypeAdapter(annotation)
+
+
+def validate_many(model: Type[Model], documents: List[Dict[str, Any]]) -> List[Model]:
+    """Validate a list of documents in a single call into pydantic-core"""
+    return type_adapter(List[model]).validate_python(documents)
+
+
+def validate_one(model: Type[Model], document: Optional[Dict[str, Any]]) -> Optional[Model]:
+    if document is None:
+        return None
+    return type_adapter(model).validate_python(document)
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _model_type(payload: Any) -> Optional[Any]:
+    """The annotation that serializes ``payload`` when it is model data, else None"""
+    if isinstance(payload, BaseModel):
+        return type(payload)
+    if isinstance(payload, list) and payload and isinstance(payload[0], BaseModel):
+        return List[type(payload[0])]
+    return None
+
+
+class Serializer:
+    """Encodes response payloads to compact UTF-8 JSON bytes.
+
+    Payloads are already-validated models (or plain data), so encoding
+    never validates again. The engine is chosen per route: ``default`` for
+    every route not named in ``overrides``.
+    """
+
+    def __init__(self, default: str = "pydantic", overrides: Optional[Mapping[str, str]] = None):
+        self.overrides = dict(overrides or {})
+        for engine in (default, *self.overrides.values()):
+            if engine not in ENGINES:
+                raise ValueError(f"Unknown serializer: {engine}")
+        self.default = default
+        if orjson is None and "orjson" in (default, *self.overrides.values()):
+            logger.warning("orjson is not installed; using the standard json encoder")
+
+    def engine_for(self, route: Optional[str]) -> str:
+        return self.overrides.get(route, self.default) if route else self.default
+
+    def encode(self, payload: Any, route: Optional[str] = None) -> bytes:
+        engine = self.engine_for(route)
+        if engine == "pydantic":
+            annotation = _model_type(payload)
+            if annotation is not None:
+                return type_adapter(annotation).dump_json(payload)
+            engine = "orjson"
+        if engine == "orjson" and orjson is not None:
+            return orjson.dumps(payload, default=_orjson_default)
+        return encode_json(payload)
+
+
+def parse_overrides(spec: Optional[str]) -> Dict[str, str]:
+    """Parse "route=engine,route=engine" into a mapping"""
+    overrides = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        route, _, engine = item.partition("=")
+        overrides[route.strip()] = engine.strip()
+    return overrides
@@ -0,0 +1,142 @@
+# Runtime configuration read from environment variables
+import os
+from typing import Any, Dict, Mapping, Optional
+
+
+def _optional_int(environ: Mapping[str, str], name: str) -> Optional[int]:
+    value = environ.get(name)
+    return int(value) if value not in (None, "") else None
+
+
+def _flag(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    return environ.get(name, "true" if default else "false").lower() in ("1", "true", "yes")
+
+
+class Settings:
+    """Every tunable the backend reads, with its environment variable.
+
+    MongoDB driver options that are left unset are not passed to the
+    client, so the driver's own defaults apply.
+    """
+
+    def __init__(self, environ: Mapping[str, str] = os.environ):
+        # Run mode: "mongo" serves from MongoDB; "snapshot" serves frozen
+        # responses built from data/prasanth_data.py and needs no database
+        self.portfolio_mode = environ.get("PORTFOLIO_MODE", "mongo").lower()
+        self.contact_store_path = environ.get("CONTACT_STORE_PATH", "contacts.jsonl")
+
+        # MongoDB connection
+        self.mongo_url = environ.get("MONGO_URL", "mongodb://localhost:27017")
+        self.database_name = environ.get("DATABASE_NAME", "prasanth_portfolio")
+
+        # Connection pool and wire protocol
+        self.mongo_max_pool_size = _optional_int(environ, "MONGO_MAX_POOL_SIZE")
+        self.mongo_min_pool_size = _optional_int(environ, "MONGO_MIN_POOL_SIZE")
+        self.mongo_max_idle_time_ms = _optional_int(environ, "MONGO_MAX_IDLE_TIME_MS")
+        self.mongo_wait_queue_timeout_ms = _optional_int(environ, "MONGO_WAIT_QUEUE_TIMEOUT_MS")
+        self.mongo_server_selection_timeout_ms = _optional_int(
+            environ, "MONGO_SERVER_SELECTION_TIMEOUT_MS"
+        )
+        self.mongo_connect_timeout_ms = _optional_int(environ, "MONGO_CONNECT_TIMEOUT_MS")
+        # Comma separated, in preference order, e.g. "zstd,snappy,zlib".
+        # zstd needs the zstandard package and snappy needs python-snappy.
+        self.mongo_compressors = environ.get("MONGO_COMPRESSORS") or None
+        self.mongo_zlib_compression_level = _optional_int(environ, "MONGO_ZLIB_COMPRESSION_LEVEL")
+        self.mongo_read_preference = environ.get("MONGO_READ_PREFERENCE") or None
+        self.mongo_app_name = environ.get("MONGO_APP_NAME", "prasanth-portfolio-api")
+
+        # Content reads may go to secondaries; writes and health stay on primary
+        self.content_read_preference = environ.get(
+            "CONTENT_READ_PREFERENCE", "secondaryPreferred"
+        )
+        self.content_max_staleness_seconds = int(
+            environ.get("CONTENT_MAX_STALENESS_SECONDS", "90")
+        )
+
+        # Content cache
+        self.content_cache_ttl_seconds = float(environ.get("CONTENT_CACHE_TTL_SECONDS", "300"))
+        self.content_cache_max_entries = int(environ.get("CONTENT_CACHE_MAX_ENTRIES", "256"))
+
+        # Live refresh of cached content from change streams (or polling when
+        # change streams are unavailable). While enabled, entries are replaced
+        # (with reads from the primary) whenever the data changes, and only
+        # expire after LIVE_REFRESH_MAX_AGE_SECONDS as a backstop.
+        self.live_refresh = _flag(environ, "LIVE_REFRESH", True)
+        self.live_refresh_poll_seconds = float(environ.get("LIVE_REFRESH_POLL_SECONDS", "1.0"))
+        self.live_refresh_max_age_seconds = float(
+            environ.get("LIVE_REFRESH_MAX_AGE_SECONDS", "3600")
+        )
+
+        # Contact write-behind queue
+        self.contact_queue_max_size = int(environ.get("CONTACT_QUEUE_MAX_SIZE", "1000"))
+        self.contact_batch_size = int(environ.get("CONTACT_BATCH_SIZE", "50"))
+        self.contact_flush_interval_seconds = float(
+            environ.get("CONTACT_FLUSH_INTERVAL_SECONDS", "0.5")
+        )
+        self.contact_journal_path = environ.get("CONTACT_JOURNAL_PATH", "contacts_journal.jsonl")
+
+        # Background MongoDB ping behind /api/health/ready
+        self.health_check_interval_seconds = float(
+            environ.get("HEALTH_CHECK_INTERVAL_SECONDS", "5")
+        )
+        self.health_check_timeout_seconds = float(
+            environ.get("HEALTH_CHECK_TIMEOUT_SECONDS", "2")
+        )
+
+        # Response encoding engine ("pydantic", "orjson" or "json"), with
+        # per-route overrides such as "stats=json,projects=orjson". Routes
+        # are keyed by collection name, plus "stats"; the portfolio is
+        # spliced from those sections' bytes and follows their engines
+        self.serializer = environ.get("SERIALIZER", "pydantic").lower()
+        self.route_serializers = environ.get("ROUTE_SERIALIZERS", "")
+
+        # Logging: "json" lines (or "text") written from a background thread;
+        # access logs are sampled, server errors are always logged
+        self.log_level = environ.get("LOG_LEVEL", "INFO")
+        self.log_format = environ.get("LOG_FORMAT", "json").lower()
+        self.access_log_sample_rate = float(environ.get("ACCESS_LOG_SAMPLE_RATE", "0.1"))
+
+        # Per-stage Server-Timing headers, and opt-in request profiling for
+        # callers presenting PROFILE_ADMIN_KEY (disabled while it is unset)
+        self.server_timing = _flag(environ, "SERVER_TIMING", True)
+        self.profile_admin_key = environ.get("PROFILE_ADMIN_KEY") or None
+        self.profile_dir = environ.get("PROFILE_DIR", "profiles")
+
+        # Circuit breaker around MongoDB calls: it opens once the failure rate
+        # over the last BREAKER_WINDOW_SIZE calls reaches BREAKER_FAILURE_RATE
+        # and lets a probe through after BREAKER_RESET_SECONDS. Calls slower
+        # than DATABASE_CALL_TIMEOUT_SECONDS count as failures (0 disables).
+        self.breaker_failure_rate = float(environ.get("BREAKER_FAILURE_RATE", "0.5"))
+        self.breaker_window_size = int(environ.get("BREAKER_WINDOW_SIZE", "20"))
+        self.breaker_min_calls = int(environ.get("BREAKER_MIN_CALLS", "5"))
+        self.breaker_reset_seconds = float(environ.get("BREAKER_RESET_SECONDS", "10"))
+        self.database_call_timeout_seconds = float(
+            environ.get("DATABASE_CALL_TIMEOUT_SECONDS", "5")
+        )
+
+        # Serve gzip (and brotli, when installed) variants of cached responses;
+        # each is compressed once per content version, never per request
+        self.response_compression = _flag(environ, "RESPONSE_COMPRESSION", True)
+
+        # Run explain() on every declared query shape at startup
+        self.index_explain_check = _flag(environ, "INDEX_EXPLAIN_CHECK", True)
+
+    @property
+    def snapshot_mode(self) -> bool:
+        return self.portfolio_mode == "snapshot"
+
+    def mongo_client_options(self) -> Dict[str, Any]:
+        """Keyword arguments for AsyncIOMotorClient (unset options omitted)"""
+        options = {
+            "maxPoolSize": self.mongo_max_pool_size,
+            "minPoolSize": self.mongo_min_pool_size,
+            "maxIdleTimeMS": self.mongo_max_idle_time_ms,
+            "waitQueueTimeoutMS": self.mongo_wait_queue_timeout_ms,
+            "serverSelectionTimeoutMS": self.mongo_server_selection_timeout_ms,
+            "connectTimeoutMS": self.mongo_connect_timeout_ms,
+            "compressors": self.mongo_compressors,
+            "zlibCompressionLevel": self.mongo_zlib_compression_level,
+            "readPreference": self.mongo_read_preference,
+            "appname": self.mongo_app_name,
+        }
+        return {name: value for name, value in options.items() if value is not None}
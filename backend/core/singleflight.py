@@ -0,0 +1,64 @@
+# Coalescing of concurrent identical reads into one in-flight call
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its outcome.
+
+    The first caller for a key starts the call as a task; callers that
+    arrive while it is running await the same task instead of issuing
+    their own query. Every waiter receives the same result, or the same
+    exception. Nothing is remembered once the call finishes, so this is
+    not a cache: the next caller after completion starts a fresh call.
+
+    Waiters are shielded from one another: a caller that is cancelled
+    (e.g. its client disconnected) stops waiting without cancelling the
+    shared call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        """Return ``await function()``, sharing an in-flight call for ``key``"""
+        task = self._calls.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(function())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def keys(self) -> List[Hashable]:
+        """Keys with a call in flight"""
+        return list(self._calls)
+
+    def forget(self, key: Hashable) -> None:
+        """Make the next caller for ``key`` start a new call.
+
+        Current waiters still get the running call's outcome; use this when
+        that outcome is known to be out of date (e.g. after a write).
+        """
+        self._calls.pop(key, None)
+
+    def _finished(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the outcome as retrieved even if every waiter was cancelled
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Shared call for {key!r} failed: {task.exception()}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "inFlight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+        }
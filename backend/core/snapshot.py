@@ -0,0 +1,124 @@
+# Zero-database serving mode built from the bundled portfolio data
+import asyncio
+import json
+from datetime import datetime, timezone
+import logging
+import os
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+from core.content_store import ContentTable, Record, record_type
+from core.responses import RenderedContent
+
+logger = logging.getLogger(__name__)
+
+EMPTY_LIST = RenderedContent(b"[]")
+
+
+class SnapshotContent:
+    """Frozen, pre-encoded responses for every read route.
+
+    Payloads are rendered (and compressed) once when the snapshot is built;
+    lookups return the same ``RenderedContent`` objects for the life of the
+    process. The documents behind list routes are kept as compact
+    slot-based records with interned strings rather than dicts or model
+    instances.
+    """
+
+    def __init__(self, compress: bool = True):
+        self.compress = compress
+        self._rendered: Dict[Tuple[str, Tuple[Hashable, ...]], RenderedContent] = {}
+        self._tables: Dict[Tuple[str, Tuple[Hashable, ...]], ContentTable] = {}
+        self._record_types: Dict[str, Type[Record]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def add(self, collection: str, payload: Any, *params: Hashable) -> None:
+        rendered = RenderedContent.render(payload)
+        if self.compress:
+            rendered.precompress()
+        self._rendered[(collection, params)] = rendered
+        if isinstance(payload, list) and payload:
+            self._tables[(collection, params)] = ContentTable.from_documents(
+                self._record_type(collection, payload[0]), payload
+            )
+
+    def _record_type(self, collection: str, sample: Any) -> Type[Record]:
+        """One record class per collection, shared by all of its tables"""
+        record_class = self._record_types.get(collection)
+        if record_class is None:
+            fields = type(sample).model_fields if isinstance(sample, BaseModel) else sample
+            record_class = record_type(f"{collection.title()}Record", fields)
+            self._record_types[collection] = record_class
+        return record_class
+
+    def set_count(self, name: str, value: int) -> None:
+        self._counts[name] = value
+
+    def get(self, collection: str, *params: Hashable) -> Optional[RenderedContent]:
+        """Return the frozen response for a query; unknown filters yield an empty list"""
+        rendered = self._rendered.get((collection, params))
+        if rendered is None and params:
+            return EMPTY_LIST
+        return rendered
+
+    def documents(self, collection: str, *params: Hashable) -> Sequence[Record]:
+        """Read-only records behind a list route, for paging and projection"""
+        table = self._tables.get((collection, params))
+        return table.records if table is not None else ()
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+
+class ContactStore:
+    """Append-only JSON-lines file for contact submissions"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = asyncio.Lock()
+        self.count = self._count_existing()
+        self.updated_at = datetime.now(timezone.utc).isoformat()
+
+    def _count_existing(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _write(self, line: bytes) -> None:
+        with open(self.path, "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def append(self, document: Dict[str, Any]) -> None:
+        line = json.dumps(document, separators=(",", ":")).encode("utf-8") + b"\n"
+        async with self._lock:
+            await asyncio.to_thread(self._write, line)
+            self.count += 1
+            self.updated_at = datetime.now(timezone.utc).isoformat()
+
+
+class SnapshotStats:
+    """Stats source for snapshot mode, mirroring ``StatsEngine``"""
+
+    def __init__(self, snapshot: SnapshotContent, contacts: ContactStore):
+        self.snapshot = snapshot
+        self.contacts = contacts
+
+    async def recount(self) -> Dict[str, Any]:
+        return await self.counts()
+
+    async def counts(self) -> Dict[str, Any]:
+        return {
+            **self.snapshot.counts,
+            "totalMessages": self.contacts.count,
+            "newMessages": self.contacts.count,
+            "lastUpdated": self.contacts.updated_at,
+        }
+
+    async def record_contact(self, count: int = 1) -> None:
+        # ContactStore.append already keeps the count current
+        pass
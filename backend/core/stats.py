@@ -0,0 +1,115 @@
+# Portfolio statistics backed by maintained counters
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo.read_preferences import Primary
+
+from core.breaker import CircuitBreaker
+from core.logs import mongo_timer
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_COLLECTION = "counters"
+COUNTERS_ID = "portfolio_stats"
+
+# Stat name -> (collection, filter) it counts
+COUNT_QUERIES: Dict[str, Tuple[str, dict]] = {
+    "totalProjects": ("projects", {}),
+    "totalTestimonials": ("testimonials", {"approved": True}),
+    "totalAwards": ("awards", {}),
+    "totalMessages": ("contacts", {}),
+    "newMessages": ("contacts", {"status": "new"}),
+}
+
+# Content collections whose edits change the counters
+COUNTED_COLLECTIONS = {"projects", "testimonials", "awards"}
+
+# Stored with the counters and changed only when they change, so the stats
+# body stays byte-identical (and cacheable) between updates
+UPDATED_FIELD = "lastUpdated"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class StatsEngine:
+    """Serves collection counts from a single counters document.
+
+    The document is rebuilt from real counts with ``recount`` (at startup
+    and after seeding) and kept current by ``record_contact`` on inserts,
+    so reading stats is one primary-key lookup instead of five scans.
+    Lookups go through ``breaker``; while they fail, the last counts read
+    are returned instead.
+    """
+
+    def __init__(
+        self,
+        db,
+        collection: str = COUNTERS_COLLECTION,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.db = db
+        # Counters are read right after being written, so always use the primary
+        self.counters = db.get_collection(collection, read_preference=Primary())
+        self.breaker = breaker
+        self._last_counts: Optional[Dict[str, Any]] = None
+
+    async def count_all(self) -> Dict[str, int]:
+        """Run every count query concurrently against the source collections"""
+        names = list(COUNT_QUERIES)
+        results = await asyncio.gather(*(
+            self.db[collection].count_documents(query)
+            for collection, query in COUNT_QUERIES.values()
+        ))
+        return dict(zip(names, results))
+
+    async def recount(self) -> Dict[str, Any]:
+        """Recompute every counter from the collections and store the result"""
+        counts: Dict[str, Any] = await self.count_all()
+        counts[UPDATED_FIELD] = _now()
+        await self.counters.replace_one({"_id": COUNTERS_ID}, counts, upsert=True)
+        self._last_counts = counts
+        return counts
+
+    async def counts(self) -> Dict[str, Any]:
+        """Return the maintained counters and when they last changed"""
+        try:
+            with mongo_timer():
+                doc = await self._find_counters()
+            if doc is None or UPDATED_FIELD not in doc:
+                counts = await self.recount()
+            else:
+                counts = {name: doc.get(name, 0) for name in COUNT_QUERIES}
+                counts[UPDATED_FIELD] = doc[UPDATED_FIELD]
+        except Exception as e:
+            if self._last_counts is None:
+                raise
+            logger.debug(f"Serving last known counters after failed read: {e}")
+            return dict(self._last_counts)
+        self._last_counts = counts
+        return counts
+
+    async def _find_counters(self):
+        def find():
+            return self.counters.find_one({"_id": COUNTERS_ID}, {"_id": 0})
+        if self.breaker is None:
+            return await find()
+        return await self.breaker.call(find)
+
+    async def record_contact(self, count: int = 1) -> None:
+        """Account for newly inserted contact submissions"""
+        try:
+            await self.counters.update_one(
+                {"_id": COUNTERS_ID},
+                {
+                    "$inc": {"totalMessages": count, "newMessages": count},
+                    "$set": {UPDATED_FIELD: _now()}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            # Counters are advisory; the next recount repairs any drift
+            logger.warning(f"Failed to update contact counters: {e}")
@@ -0,0 +1,36 @@
+# Bounded shutdown of background tasks
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CANCEL_ATTEMPTS = 3
+STOP_TIMEOUT_SECONDS = 5.0
+
+
+async def cancel_and_wait(task: "asyncio.Future", timeout: Optional[float] = None) -> bool:
+    """Cancel ``task`` and wait at most ``timeout`` (default
+    ``STOP_TIMEOUT_SECONDS``) seconds for it to finish.
+
+    A cancellation can be swallowed if it lands just as an inner await
+    completes, so the task is cancelled again on each of a few waits
+    instead of awaited without a limit. Returns False if the task is still
+    running after ``timeout``; it is then left behind rather than letting
+    shutdown hang on it.
+    """
+    if timeout is None:
+        timeout = STOP_TIMEOUT_SECONDS
+    for _ in range(CANCEL_ATTEMPTS):
+        if task.done():
+            break
+        task.cancel()
+        await asyncio.wait({task}, timeout=timeout / CANCEL_ATTEMPTS)
+
+    if not task.done():
+        logger.warning(f"Background task {task!r} ignored cancellation, abandoning it")
+        return False
+    # Retrieve the outcome so a failure is not reported as never retrieved
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Background task failed before stopping: {task.exception()}")
+    return True
@@ -1,14 +1,40 @@
 # Prasanth Davuluri Portfolio Backend Server
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from motor.motor_asyncio import AsyncIOMotorClient
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pymongo import DESCENDING
 from pydantic import BaseModel, Field
-from typing import List, Optional, Any, Dict, Union
-import os
+from typing import List, Optional, Any, Dict, Set, Union
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import uuid
 import logging
+import math
+
+# Import cache and response rendering
+from core.responses import RenderedContent
+from core.breaker import TRANSIENT_ERRORS, CircuitOpenError
+from core.stats import COUNTED_COLLECTIONS
+from core.indexes import ensure_indexes, report_unindexed_queries
+from core.seeding import SeedDataset, SeedEngine
+from core.snapshot import ContactStore, SnapshotContent, SnapshotStats
+from core.contact_queue import ContactWriteQueue
+from core.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NDJSON_MEDIA_TYPE, InvalidQuery, KeysetSpec,
+    iterate, ndjson_lines, page_in_memory, parse_fields, project
+)
+from core.repository import ContentRepository, QuerySpec
+from core.resources import AppResources, get_resources
+from core.settings import Settings
+from core.live_refresh import ContentWatcher
+from core.health import HealthMonitor
+from core.logs import AccessLogMiddleware, configure_logging, mongo_timer, stage
+from core.profiling import ProfilingMiddleware
+from core.serialization import validate_many, validate_one
+from core.metrics import (
+    PROMETHEUS_MEDIA_TYPE, MetricsMiddleware, RequestMetrics, render_gauges, render_text
+)
 
 # Import data
 from data.prasanth_data import (
@@ -17,31 +43,10 @@ from data.prasanth_data import (
     DEFAULT_AWARDS, DEFAULT_STATS
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="Prasanth Davuluri Portfolio API",
-    description="Backend API for Prasanth Davuluri's Professional Portfolio",
-    version="2.0.0"
-)
-
-# CORS Configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# MongoDB connection
-MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
-DATABASE_NAME = "prasanth_portfolio"
-
-client = None
-db = None
+# Every route is registered on this router; create_app() mounts it
+router = APIRouter()
 
 # Pydantic Models
 class ProfileModel(BaseModel):
@@ -123,85 +128,495 @@ class ContactModel(BaseModel):
     phone: Optional[str] = None
     company: Optional[str] = None
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database connection and seed data"""
-    global client, db
+# Every content read the API makes; projections come from the models
+QUERIES = {
+    "profile": QuerySpec("profile", ProfileModel, {"id": DEFAULT_PROFILE["id"]}),
+    "skills": QuerySpec("skills", SkillModel),
+    "experience": QuerySpec("experience", ExperienceModel, sort=[("duration", DESCENDING)]),
+    "projects": QuerySpec("projects", ProjectModel),
+    "testimonials": QuerySpec("testimonials", TestimonialModel, {"approved": True}),
+    "certifications": QuerySpec("certifications", CertificationModel, sort=[("date", DESCENDING)]),
+    "awards": QuerySpec("awards", AwardModel, sort=[("year", DESCENDING)]),
+}
+
+def build_snapshot(compress: bool = True) -> SnapshotContent:
+    """Validate the default datasets and pre-encode every read route"""
+    snapshot = SnapshotContent(compress)
+    
+    projects = [ProjectModel(**project) for project in DEFAULT_PROJECTS]
+    testimonials = [
+        TestimonialModel(**testimonial) for testimonial in DEFAULT_TESTIMONIALS
+        if testimonial.get("approved")
+    ]
+    awards = [AwardModel(**award) for award in DEFAULT_AWARDS]
+    
+    # Same filters and sort orders as the MongoDB queries
+    snapshot.add("profile", ProfileModel(**DEFAULT_PROFILE))
+    snapshot.add("skills", [SkillModel(**skill) for skill in DEFAULT_SKILLS])
+    snapshot.add("experience", sorted(
+        (ExperienceModel(**exp) for exp in DEFAULT_EXPERIENCE),
+        key=lambda exp: exp.duration, reverse=True
+    ))
+    snapshot.add("projects", projects)
+    for category in {project.category for project in projects}:
+        snapshot.add("projects", [p for p in projects if p.category == category], category)
+    snapshot.add("testimonials", testimonials)
+    snapshot.add("certifications", sorted(
+        (CertificationModel(**cert) for cert in DEFAULT_CERTIFICATIONS),
+        key=lambda cert: cert.date, reverse=True
+    ))
+    snapshot.add("awards", sorted(awards, key=lambda award: award.year, reverse=True))
+    
+    snapshot.set_count("totalProjects", len(projects))
+    snapshot.set_count("totalTestimonials", len(testimonials))
+    snapshot.set_count("totalAwards", len(awards))
+    return snapshot
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the database client, caches and workers for the app's lifetime"""
+    settings: Settings = app.state.settings
+    resources = AppResources(settings, snapshot=app.state.snapshot)
+    
+    if resources.snapshot_mode:
+        resources.contact_store = ContactStore(settings.contact_store_path)
+        resources.stats = SnapshotStats(resources.snapshot, resources.contact_store)
+        logger.info("Serving static snapshot; MongoDB is not used")
+    else:
+        try:
+            await start_database(resources)
+        except Exception as e:
+            logger.error(f"Failed to connect to MongoDB: {e}")
+            await resources.aclose()
+            raise
+    
+    app.state.resources = resources
     try:
-        client = AsyncIOMotorClient(MONGO_URL)
-        db = client[DATABASE_NAME]
-        
-        # Test connection
-        await client.admin.command('ping')
-        logger.info("Connected to MongoDB successfully")
-        
-        # Seed database with default data
-        await seed_database()
-        logger.info("Database seeded successfully")
+        yield
+    finally:
+        # Stop watching, flush pending contact writes, close the client
+        await resources.aclose()
+
+async def start_database(resources: AppResources):
+    """Initialize database connection, seed data and start background workers"""
+    settings = resources.settings
+    resources.connect()
+    db = resources.db
+    
+    # Test connection
+    await resources.client.admin.command('ping')
+    logger.info("Connected to MongoDB successfully")
+    
+    # Make sure every query shape has its index
+    await ensure_indexes(db)
+    logger.info("Database indexes ensured")
+    
+    # Seed database with default data
+    await seed_database(resources)
+    logger.info("Database seeded successfully")
+    
+    # Rebuild stats counters from the collections
+    await resources.stats.recount()
+    
+    # Start the contact write-behind worker (replays any journal first)
+    resources.contact_queue = ContactWriteQueue(
+        db.contacts,
+        journal_path=settings.contact_journal_path,
+        max_size=settings.contact_queue_max_size,
+        batch_size=settings.contact_batch_size,
+        flush_interval=settings.contact_flush_interval_seconds,
+        on_flush=resources.stats.record_contact,
+        breaker=resources.breaker
+    )
+    await resources.contact_queue.start()
+    
+    # Follow content changes made by other processes; entries are then
+    # replaced on change, and only expire as a backstop
+    if settings.live_refresh:
+        async def on_content_change(collections: Set[str]):
+            """Keep derived counters in step with content edited elsewhere"""
+            if collections & COUNTED_COLLECTIONS:
+                await resources.stats.recount()
         
-    except Exception as e:
-        logger.error(f"Failed to connect to MongoDB: {e}")
-        raise
+        resources.cache.ttl_seconds = settings.live_refresh_max_age_seconds
+        resources.watcher = ContentWatcher(
+            db,
+            resources.cache,
+            list(CONTENT_LOADERS),
+            poll_interval=settings.live_refresh_poll_seconds,
+            on_change=on_content_change
+        )
+        await resources.watcher.start()
+    
+    if settings.index_explain_check:
+        await report_unindexed_queries(db)
+    
+    # Keep the readiness status fresh without probes touching the database
+    resources.health = HealthMonitor(
+        resources.client,
+        interval=settings.health_check_interval_seconds,
+        timeout=settings.health_check_timeout_seconds
+    )
+    await resources.health.start()
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Close database connection"""
-    if client:
-        client.close()
-        logger.info("MongoDB connection closed")
+# Default datasets, keyed by the field that identifies each document
+SEED_DATASETS = [
+    SeedDataset("profile", [DEFAULT_PROFILE]),
+    SeedDataset("skills", DEFAULT_SKILLS, key="name"),
+    SeedDataset("experience", DEFAULT_EXPERIENCE),
+    SeedDataset("projects", DEFAULT_PROJECTS),
+    SeedDataset("testimonials", DEFAULT_TESTIMONIALS),
+    SeedDataset("certifications", DEFAULT_CERTIFICATIONS),
+    SeedDataset("awards", DEFAULT_AWARDS),
+]
 
-async def seed_database():
+async def seed_database(resources: AppResources):
     """Seed database with default portfolio data"""
     try:
-        # Check if data already exists
-        existing_profile = await db.profile.find_one({"id": DEFAULT_PROFILE["id"]})
-        if existing_profile:
+        # Only datasets whose content hash changed since the last seed are written
+        written = await SeedEngine(resources.db).sync(SEED_DATASETS)
+        if not written:
             logger.info("Database already seeded, skipping...")
             return
-
-        # Insert default data
-        await db.profile.insert_one(DEFAULT_PROFILE)
-        await db.skills.insert_many(DEFAULT_SKILLS)
-        await db.experience.insert_many(DEFAULT_EXPERIENCE)
-        await db.projects.insert_many(DEFAULT_PROJECTS)
-        await db.testimonials.insert_many(DEFAULT_TESTIMONIALS)
-        await db.certifications.insert_many(DEFAULT_CERTIFICATIONS)
-        await db.awards.insert_many(DEFAULT_AWARDS)
         
-        logger.info("Default data inserted successfully")
+        # Drop anything cached for the collections we wrote, and reload them
+        # from the primary until the secondaries have caught up
+        resources.cache.invalidate(*written)
+        resources.mark_written(*written)
+        logger.info(f"Default data synced for: {', '.join(written)}")
         
     except Exception as e:
         logger.error(f"Error seeding database: {e}")
 
 # API Endpoints
 
-@app.get("/api/health")
-async def health_check():
-    """Health check endpoint"""
-    try:
-        # Test database connection
-        await client.admin.command('ping')
-        return {
-            "status": "healthy",
-            "database": "connected",
+SERVICE_INFO = {
+    "service": "Prasanth Davuluri Portfolio API",
+    "version": "2.0.0"
+}
+
+def readiness(resources: AppResources) -> Dict[str, Any]:
+    """Dependency status from the last background check (no I/O)"""
+    report: Dict[str, Any] = {"ready": True}
+    if resources.snapshot_mode:
+        report["database"] = {"status": "snapshot"}
+    else:
+        report["ready"] = resources.health.ready
+        report["database"] = resources.health.status()
+        report["pool"] = resources.pool_metrics.snapshot()
+        report["contactQueue"] = resources.contact_queue.stats()
+        report["circuit"] = resources.breaker.stats()
+    report["cache"] = resources.cache.stats()
+    return report
+
+@router.get("/api/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive", **SERVICE_INFO}
+
+@router.get("/api/health/ready")
+async def readiness_check(resources: AppResources = Depends(get_resources)):
+    """Readiness probe: cached dependency status, pool, cache and queue stats"""
+    report = readiness(resources)
+    return JSONResponse(
+        status_code=200 if report["ready"] else 503,
+        content={
+            "status": "ready" if report.pop("ready") else "unavailable",
+            **report,
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "service": "Prasanth Davuluri Portfolio API",
-            "version": "2.0.0"
+            **SERVICE_INFO
         }
-    except Exception as e:
-        raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}")
+    )
 
-@app.get("/api/profile", response_model=ProfileModel)
-async def get_profile():
-    """Get profile information"""
+@router.get("/api/health")
+async def health_check(resources: AppResources = Depends(get_resources)):
+    """Health check endpoint"""
+    report = readiness(resources)
+    database = report["database"]
+    if not report["ready"]:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Database connection failed: {database['error']}"
+        )
+    
+    health = {
+        "status": "healthy",
+        "database": database["status"],
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **SERVICE_INFO
+    }
+    if "pool" in report:
+        health["pool"] = report["pool"]
+    return health
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request, resources: AppResources = Depends(get_resources)):
+    """Prometheus metrics: request latencies, MongoDB commands, pool, cache and queue"""
+    lines = request.app.state.metrics.render()
+    lines += resources.command_metrics.render()
+    lines += render_gauges("portfolio_cache", resources.cache.stats(), "Content cache")
+    lines += render_gauges(
+        "singleflight", resources.flights.stats(), "Coalesced uncached reads"
+    )
+    if not resources.snapshot_mode:
+        lines += render_gauges(
+            "mongodb_pool", resources.pool_metrics.snapshot(), "MongoDB connection pool"
+        )
+        lines += render_gauges(
+            "contact_queue", resources.contact_queue.stats(), "Contact write queue"
+        )
+        lines += render_gauges(
+            "mongodb_circuit", resources.breaker.stats(), "MongoDB circuit breaker"
+        )
+    return Response(content=render_text(lines), media_type=PROMETHEUS_MEDIA_TYPE)
+
+# Content loaders (run on cache miss)
+
+async def load_content(
+    resources: AppResources,
+    collection: str,
+    *params
+) -> Optional[RenderedContent]:
+    """Return the cached, pre-serialized JSON for a collection query"""
+    if resources.snapshot_mode:
+        return resources.snapshot.get(collection, *params)
+    
+    loader = CONTENT_LOADERS[collection]
+    
+    async def load_rendered(repository: ContentRepository) -> Optional[RenderedContent]:
+        payload = await loader(repository, *params)
+        if payload is None:
+            return None
+        with stage("encode"):
+            return RenderedContent(resources.serializer.encode(payload, collection))
+
+    # Refreshes follow a change on the primary, so they must not read a
+    # secondary that has yet to apply it
+    return await resources.cache.get_or_load(
+        collection,
+        lambda: load_rendered(resources.repository_for(collection)),
+        *params,
+        reloader=lambda: load_rendered(resources.primary_repository)
+    )
+
+# Reads that fail because MongoDB is down (and nothing was ever cached for
+# them) get a 503 with Retry-After instead of a 500
+UNAVAILABLE_ERRORS = (CircuitOpenError, *TRANSIENT_ERRORS)
+
+def database_unavailable(resources: AppResources) -> HTTPException:
+    retry_after = math.ceil(resources.breaker.retry_after()) or 1
+    return HTTPException(
+        status_code=503,
+        detail="Database temporarily unavailable",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+async def serve_content(
+    request: Request,
+    resources: AppResources,
+    collection: str,
+    *params,
+    not_found: str = "Not found"
+) -> Response:
+    """Serve a content route from cached, pre-serialized JSON bytes"""
+    try:
+        rendered = await load_content(resources, collection, *params)
+    except UNAVAILABLE_ERRORS:
+        raise database_unavailable(resources)
+    if rendered is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    if resources.settings.response_compression and not rendered.compressed:
+        # Reloads keep the cached object when the ETag is unchanged, so this
+        # runs once per content version and only for routes actually served
+        with stage("compress"):
+            rendered.precompress()
+    return rendered.respond(request)
+
+# Paginated, projected and streamed list reads (bypass the content cache)
+
+# Keyset order used to page each list collection
+PAGINATION_KEYS = {
+    "projects": KeysetSpec(),
+    "testimonials": KeysetSpec(),
+    "certifications": KeysetSpec("date", DESCENDING),
+    "awards": KeysetSpec("year", DESCENDING),
+}
+
+class ListQueryParams:
+    """Pagination, projection and streaming options shared by list endpoints"""
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        format: Optional[str] = None
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+        self.format = format
+
+    def requested(self, request: Request) -> bool:
+        """True when the caller asked for anything beyond the full cached list"""
+        return bool(
+            self.limit or self.cursor or self.fields or self.format
+            or self.wants_stream(request)
+        )
+
+    def wants_stream(self, request: Request) -> bool:
+        return (
+            self.format == "ndjson"
+            or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+        )
+
+async def list_query_params(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: Optional[str] = Query(None, pattern="^(json|ndjson)$")
+) -> ListQueryParams:
+    """Parse list options on the event loop (sync dependencies run in a thread pool)"""
+    return ListQueryParams(limit, cursor, fields, format)
+
+async def serve_documents(
+    request: Request,
+    resources: AppResources,
+    collection: str,
+    params: ListQueryParams,
+    *snapshot_params,
+    query: Optional[Dict[str, Any]] = None
+) -> Response:
+    """Serve a page (or an NDJSON stream) of projected documents.
+
+    Pages are returned as a JSON list with the cursor for the next page in
+    the X-Next-Cursor header. Streams yield documents as the database cursor
+    produces them.
+    """
+    spec = QUERIES[collection]
+    keyset = PAGINATION_KEYS[collection]
     try:
-        profile = await db.profile.find_one({"id": DEFAULT_PROFILE["id"]})
-        if not profile:
-            raise HTTPException(status_code=404, detail="Profile not found")
+        selected = parse_fields(params.fields, spec.fields)
+        # Selected fields in the requested order, the same in both modes
+        projection = spec.projection(selected) if selected else None
+        fields = None
+        if selected:
+            # The cursor needs the sort keys even when they were not selected;
+            # they are stripped again once it has been computed
+            fields = list(dict.fromkeys([*selected, *keyset.fields]))
+        limit = params.limit or (DEFAULT_PAGE_SIZE if params.cursor else None)
+        stream = params.wants_stream(request)
         
-        # Remove MongoDB _id field
-        profile.pop('_id', None)
-        return ProfileModel(**profile)
+        if resources.snapshot_mode:
+            page, next_cursor = page_in_memory(
+                resources.snapshot.documents(collection, *snapshot_params),
+                keyset, params.cursor, limit
+            )
+            documents = [project(doc, spec.projection(selected)) for doc in page]
+            if stream:
+                return StreamingResponse(
+                    ndjson_lines(iterate(documents)), media_type=NDJSON_MEDIA_TYPE
+                )
+        else:
+            query = dict(query or {})
+            if params.cursor:
+                query.update(keyset.after(params.cursor))
+            repository = resources.repository_for(collection)
+            if stream:
+                # Streams carry no cursor, so only the selected fields are read
+                cursor = repository.cursor(spec, query, selected, keyset.sort())
+                if limit:
+                    cursor = cursor.limit(limit)
+                resources.breaker.check()
+                return StreamingResponse(
+                    ndjson_lines(cursor, projection), media_type=NDJSON_MEDIA_TYPE
+                )
+            
+            cursor = repository.cursor(spec, query, fields, keyset.sort())
+            
+            # Fetch one extra document to learn whether another page exists
+            if limit:
+                cursor = cursor.limit(limit + 1)
+            
+            async def fetch_page():
+                with mongo_timer():
+                    documents = await cursor.to_list(length=None)
+                next_cursor = None
+                if limit and len(documents) > limit:
+                    documents = documents[:limit]
+                    next_cursor = keyset.cursor_for(documents[-1])
+                if projection:
+                    documents = [project(doc, projection) for doc in documents]
+                return documents, next_cursor
+            
+            # Identical concurrent page requests share one query; field order
+            # does not change the result, so it is not part of the key
+            key = (
+                collection, snapshot_params, params.cursor, limit,
+                tuple(sorted(fields)) if fields else None
+            )
+            documents, next_cursor = await resources.flights.do(
+                key, lambda: resources.repository.run(fetch_page)
+            )
+    
+    except InvalidQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UNAVAILABLE_ERRORS:
+        raise database_unavailable(resources)
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    with stage("encode"):
+        body = resources.serializer.encode(documents, collection)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Documents arrive already projected to the model fields (no _id) and are
+# validated once, in a single TypeAdapter call per list ("validate" stage)
+
+async def load_profile(repository: ContentRepository) -> Optional[ProfileModel]:
+    profile = await repository.find_one(QUERIES["profile"])
+    with stage("validate"):
+        return validate_one(ProfileModel, profile)
+
+async def load_skills(repository: ContentRepository) -> List[SkillModel]:
+    skills = await repository.find_all(QUERIES["skills"])
+    with stage("validate"):
+        return validate_many(SkillModel, skills)
+
+async def load_experience(repository: ContentRepository) -> List[ExperienceModel]:
+    experience = await repository.find_all(QUERIES["experience"])
+    with stage("validate"):
+        return validate_many(ExperienceModel, experience)
+
+async def load_projects(
+    repository: ContentRepository,
+    category: Optional[str] = None
+) -> List[ProjectModel]:
+    query = {"category": category} if category else None
+    projects = await repository.find_all(QUERIES["projects"], query)
+    with stage("validate"):
+        return validate_many(ProjectModel, projects)
+
+async def load_testimonials(repository: ContentRepository) -> List[TestimonialModel]:
+    testimonials = await repository.find_all(QUERIES["testimonials"])
+    with stage("validate"):
+        return validate_many(TestimonialModel, testimonials)
+
+async def load_certifications(repository: ContentRepository) -> List[CertificationModel]:
+    certifications = await repository.find_all(QUERIES["certifications"])
+    with stage("validate"):
+        return validate_many(CertificationModel, certifications)
+
+async def load_awards(repository: ContentRepository) -> List[AwardModel]:
+    awards = await repository.find_all(QUERIES["awards"])
+    with stage("validate"):
+        return validate_many(AwardModel, awards)
+
+@router.get("/api/profile", response_model=ProfileModel)
+async def get_profile(request: Request, resources: AppResources = Depends(get_resources)):
+    """Get profile information"""
+    try:
+        return await serve_content(
+            request, resources, "profile", not_found="Profile not found"
+        )
         
     except HTTPException:
         raise
@@ -209,96 +624,117 @@ async def get_profile():
         logger.error(f"Error fetching profile: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/api/skills", response_model=List[SkillModel])
-async def get_skills():
+@router.get("/api/skills", response_model=List[SkillModel])
+async def get_skills(request: Request, resources: AppResources = Depends(get_resources)):
     """Get all skills"""
     try:
-        skills = await db.skills.find().to_list(length=None)
-        # Remove MongoDB _id fields
-        for skill in skills:
-            skill.pop('_id', None)
-        return [SkillModel(**skill) for skill in skills]
+        return await serve_content(request, resources, "skills")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching skills: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/api/experience", response_model=List[ExperienceModel])
-async def get_experience():
+@router.get("/api/experience", response_model=List[ExperienceModel])
+async def get_experience(request: Request, resources: AppResources = Depends(get_resources)):
     """Get work experience"""
     try:
-        experience = await db.experience.find().sort("duration", -1).to_list(length=None)
-        # Remove MongoDB _id fields
-        for exp in experience:
-            exp.pop('_id', None)
-        return [ExperienceModel(**exp) for exp in experience]
+        return await serve_content(request, resources, "experience")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching experience: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/api/projects", response_model=List[ProjectModel])
-async def get_projects(category: Optional[str] = None):
+@router.get("/api/projects", response_model=List[ProjectModel])
+async def get_projects(
+    request: Request,
+    category: Optional[str] = None,
+    list_params: ListQueryParams = Depends(list_query_params),
+    resources: AppResources = Depends(get_resources)
+):
     """Get projects, optionally filtered by category"""
     try:
-        query = {}
-        if category:
-            query["category"] = category
-            
-        projects = await db.projects.find(query).to_list(length=None)
-        # Remove MongoDB _id fields
-        for project in projects:
-            project.pop('_id', None)
-        return [ProjectModel(**project) for project in projects]
+        # Unfiltered projects share a cache key with the portfolio section
+        params = (category,) if category else ()
+        if list_params.requested(request):
+            query = {"category": category} if category else None
+            return await serve_documents(
+                request, resources, "projects", list_params, *params, query=query
+            )
         
+        return await serve_content(request, resources, "projects", *params)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching projects: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/api/testimonials", response_model=List[TestimonialModel])
-async def get_testimonials():
+@router.get("/api/testimonials", response_model=List[TestimonialModel])
+async def get_testimonials(
+    request: Request,
+    list_params: ListQueryParams = Depends(list_query_params),
+    resources: AppResources = Depends(get_resources)
+):
     """Get approved testimonials"""
     try:
-        testimonials = await db.testimonials.find({"approved": True}).to_list(length=None)
-        # Remove MongoDB _id fields
-        for testimonial in testimonials:
-            testimonial.pop('_id', None)
-        return [TestimonialModel(**testimonial) for testimonial in testimonials]
+        if list_params.requested(request):
+            return await serve_documents(request, resources, "testimonials", list_params)
         
+        return await serve_content(request, resources, "testimonials")
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching testimonials: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/api/certifications", response_model=List[CertificationModel])
-async def get_certifications():
+@router.get("/api/certifications", response_model=List[CertificationModel])
+async def get_certifications(
+    request: Request,
+    list_params: ListQueryParams = Depends(list_query_params),
+    resources: AppResources = Depends(get_resources)
+):
     """Get certifications"""
     try:
-        certifications = await db.certifications.find().sort("date", -1).to_list(length=None)
-        # Remove MongoDB _id fields
-        for cert in certifications:
-            cert.pop('_id', None)
-        return [CertificationModel(**cert) for cert in certifications]
+        if list_params.requested(request):
+            return await serve_documents(request, resources, "certifications", list_params)
         
+        return await serve_content(request, resources, "certifications")
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching certifications: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/api/awards", response_model=List[AwardModel])
-async def get_awards():
+@router.get("/api/awards", response_model=List[AwardModel])
+async def get_awards(
+    request: Request,
+    list_params: ListQueryParams = Depends(list_query_params),
+    resources: AppResources = Depends(get_resources)
+):
     """Get awards and recognitions"""
     try:
-        awards = await db.awards.find().sort("year", -1).to_list(length=None)
-        # Remove MongoDB _id fields
-        for award in awards:
-            award.pop('_id', None)
-        return [AwardModel(**award) for award in awards]
+        if list_params.requested(request):
+            return await serve_documents(request, resources, "awards", list_params)
         
+        return await serve_content(request, resources, "awards")
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching awards: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.post("/api/contact")
-async def submit_contact(contact: ContactModel):
+@router.post("/api/contact")
+async def submit_contact(
+    contact: ContactModel,
+    resources: AppResources = Depends(get_resources)
+):
     """Submit contact form"""
     try:
         # Generate unique ID for the contact submission
@@ -316,8 +752,12 @@ async def submit_contact(contact: ContactModel):
             "status": "new"
         }
         
-        # Insert into database
-        await db.contacts.insert_one(contact_data)
+        # Queue for a batched database write (or append to the local store
+        # in snapshot mode); either way the user is not kept waiting
+        if resources.snapshot_mode:
+            await resources.contact_store.append(contact_data)
+        else:
+            await resources.contact_queue.submit(contact_data)
         
         return {
             "message": "Contact form submitted successfully",
@@ -329,42 +769,152 @@ async def submit_contact(contact: ContactModel):
         logger.error(f"Error submitting contact form: {e}")
         raise HTTPException(status_code=500, detail="Failed to submit contact form")
 
-@app.get("/api/stats")
-async def get_stats():
+async def compute_stats(resources: AppResources) -> Dict[str, Any]:
+    """Combine static stats with the maintained collection counters"""
+    # Counts come from maintained counters, not collection scans; concurrent
+    # requests share one lookup. lastUpdated is stored with the counters, so
+    # the result only changes when they do.
+    counts = await resources.flights.do("stats", resources.stats.counts)
+    
+    return {**DEFAULT_STATS, **counts}
+
+@router.get("/api/stats")
+async def get_stats(request: Request, resources: AppResources = Depends(get_resources)):
     """Get portfolio statistics"""
     try:
-        # Get dynamic stats
-        total_projects = await db.projects.count_documents({})
-        total_testimonials = await db.testimonials.count_documents({"approved": True})
-        total_awards = await db.awards.count_documents({})
-        total_messages = await db.contacts.count_documents({})
-        new_messages = await db.contacts.count_documents({"status": "new"})
+        stats = await compute_stats(resources)
+        with stage("encode"):
+            body = resources.serializer.encode(stats, "stats")
+        return resources.rendered.get(body).respond(request)
         
-        stats = {
-            **DEFAULT_STATS,
-            "totalProjects": total_projects,
-            "totalTestimonials": total_testimonials,
-            "totalAwards": total_awards,
-            "totalMessages": total_messages,
-            "newMessages": new_messages,
-            "lastUpdated": datetime.now(timezone.utc).isoformat()
-        }
+    except UNAVAILABLE_ERRORS:
+        raise database_unavailable(resources)
+    except Exception as e:
+        logger.error(f"Error fetching stats: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+# Sections of the aggregated portfolio document, in response order.
+# Content sections come from the cache; stats are read per request but are
+# byte-identical until the counters change.
+CONTENT_LOADERS = {
+    "profile": load_profile,
+    "skills": load_skills,
+    "experience": load_experience,
+    "projects": load_projects,
+    "testimonials": load_testimonials,
+    "certifications": load_certifications,
+    "awards": load_awards,
+}
+PORTFOLIO_SECTIONS = (*CONTENT_LOADERS, "stats")
+
+async def load_portfolio_section(resources: AppResources, section: str) -> bytes:
+    """Return the JSON bytes for one portfolio section"""
+    if section == "stats":
+        return resources.serializer.encode(await compute_stats(resources), "stats")
+    
+    rendered = await load_content(resources, section)
+    return rendered.body if rendered is not None else b"null"
+
+@router.get("/api/portfolio")
+async def get_portfolio(
+    request: Request,
+    fields: Optional[str] = None,
+    resources: AppResources = Depends(get_resources)
+):
+    """Get the whole portfolio (or the sections named in `fields`) in one response"""
+    if fields:
+        sections = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [section for section in sections if section not in PORTFOLIO_SECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown portfolio fields: {', '.join(unknown)}"
+            )
+        sections = list(dict.fromkeys(sections))
+    else:
+        sections = list(PORTFOLIO_SECTIONS)
+    
+    try:
+        bodies = await asyncio.gather(
+            *(load_portfolio_section(resources, section) for section in sections)
+        )
         
-        return stats
+        # Splice the cached section bodies together without re-encoding them
+        body = b"{" + b",".join(
+            b'"' + section.encode() + b'":' + section_body
+            for section, section_body in zip(sections, bodies)
+        ) + b"}"
+        # Compressed once per combination of section versions
+        return resources.rendered.get(body).respond(request)
         
+    except UNAVAILABLE_ERRORS:
+        raise database_unavailable(resources)
     except Exception as e:
-        logger.error(f"Error fetching stats: {e}")
+        logger.error(f"Error fetching portfolio: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 # Global exception handler
-@app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Global exception handler caught: {exc}")
+    logger.error(f"Global exception handler caught: {exc}", exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error occurred"}
     )
 
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build an app instance with its own settings and resources.
+
+    Several instances can live in one process (e.g. in benchmarks); each
+    lifespan owns a separate client, cache and set of workers.
+    """
+    # Configuration (see core/settings.py for every environment variable)
+    settings = settings or Settings()
+    configure_logging(settings.log_level, settings.log_format)
+    
+    app = FastAPI(
+        title="Prasanth Davuluri Portfolio API",
+        description="Backend API for Prasanth Davuluri's Professional Portfolio",
+        version="2.0.0",
+        lifespan=lifespan
+    )
+    app.state.settings = settings
+    app.state.metrics = RequestMetrics()
+    # Built (and validated) up front so a bad dataset fails the boot
+    app.state.snapshot = (
+        build_snapshot(settings.response_compression) if settings.snapshot_mode else None
+    )
+    
+    # CORS Configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, replace with specific origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Lets browser clients on other origins read the pagination cursor
+        expose_headers=["X-Next-Cursor"],
+    )
+    
+    # The middleware added last runs first: the access log sets the request
+    # context every later stage records into, metrics time everything
+    # below them, and profiling wraps the routes most closely
+    app.add_middleware(
+        ProfilingMiddleware,
+        admin_key=settings.profile_admin_key,
+        profile_dir=settings.profile_dir,
+        server_timing=settings.server_timing
+    )
+    app.add_middleware(
+        MetricsMiddleware, metrics=app.state.metrics, routes=app.router.routes
+    )
+    app.add_middleware(AccessLogMiddleware, sample_rate=settings.access_log_sample_rate)
+    
+    app.include_router(router)
+    app.add_exception_handler(Exception, global_exception_handler)
+    return app
+
+app = create_app()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
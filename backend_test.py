@@ -2,30 +2,61 @@
 """
 Backend API Test Suite for Prasanth Davuluri's Automotive Specialist Portfolio
 Tests all API endpoints for functionality, data structure, and error handling
+
+Checks run concurrently over one pooled async client, against a deployed
+backend or an in-process app:
+
+    python backend_test.py --base-url https://example.com/api
+    python backend_test.py --local        # backend/server.py, no network
 """
 
-import requests
+import argparse
+import asyncio
+import httpx
 import json
 import os
+import sys
+import time
+from contextlib import AsyncExitStack
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 # Get backend URL from environment
-BACKEND_URL = "https://auto-portfolio.preview.emergentagent.com/api"
+BACKEND_URL = os.environ.get("BACKEND_URL", "https://auto-portfolio.preview.emergentagent.com/api")
+
+# Base URL used for an in-process ASGI app
+LOCAL_BASE_URL = "http://testserver/api"
+
+# When the currently running check started (each check runs in its own task)
+check_started: ContextVar[float] = ContextVar("check_started")
 
 class PortfolioAPITester:
-    def __init__(self):
-        self.base_url = BACKEND_URL
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        app: Any = None,
+        timeout: float = 30.0,
+        run_lifespan: bool = True
+    ):
+        """Target a deployed backend by URL, or an ASGI app in-process"""
+        self.app = app
+        self.base_url = (base_url or (LOCAL_BASE_URL if app is not None else BACKEND_URL)).rstrip("/")
+        self.timeout = timeout
+        self.run_lifespan = run_lifespan
+        self.client: Optional[httpx.AsyncClient] = None
         self.test_results = []
         self.failed_tests = []
         
     def log_test(self, test_name: str, success: bool, message: str, response_data: Any = None):
         """Log test results"""
+        started = check_started.get(None)
         result = {
             "test": test_name,
             "success": success,
             "message": message,
             "timestamp": datetime.now().isoformat(),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2) if started else None,
             "response_data": response_data
         }
         self.test_results.append(result)
@@ -34,34 +65,34 @@ class PortfolioAPITester:
             self.failed_tests.append(result)
             
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}: {message}")
+        timing = f" ({result['duration_ms']:.1f} ms)" if started else ""
+        print(f"{status} {test_name}{timing}: {message}")
         
-    def make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None) -> requests.Response:
+    async def make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None) -> httpx.Response:
         """Make HTTP request with error handling"""
-        url = f"{self.base_url}{endpoint}"
         try:
             if method.upper() == "GET":
-                response = requests.get(url, params=params, timeout=30)
+                response = await self.client.get(endpoint, params=params)
             elif method.upper() == "POST":
-                response = requests.post(url, json=data, timeout=30)
+                response = await self.client.post(endpoint, json=data)
             else:
                 raise ValueError(f"Unsupported method: {method}")
             return response
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Request failed for {endpoint}: {str(e)}")
             raise
     
-    def test_health_endpoint(self):
+    async def test_health_endpoint(self):
         """Test GET /api/health endpoint"""
         try:
-            response = self.make_request("GET", "/health")
+            response = await self.make_request("GET", "/health")
             
             if response.status_code == 200:
                 data = response.json()
                 required_fields = ["status", "database", "timestamp"]
                 
                 if all(field in data for field in required_fields):
-                    if data["status"] == "healthy" and data["database"] == "connected":
+                    if data["status"] == "healthy" and data["database"] in ("connected", "snapshot"):
                         self.log_test("Health Check", True, "Health endpoint working correctly", data)
                     else:
                         self.log_test("Health Check", False, f"Health status not healthy: {data}")
@@ -73,10 +104,10 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Health Check", False, f"Exception occurred: {str(e)}")
     
-    def test_profile_endpoint(self):
+    async def test_profile_endpoint(self):
         """Test GET /api/profile endpoint"""
         try:
-            response = self.make_request("GET", "/profile")
+            response = await self.make_request("GET", "/profile")
             
             if response.status_code == 200:
                 data = response.json()
@@ -99,10 +130,10 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Profile Data", False, f"Exception occurred: {str(e)}")
     
-    def test_skills_endpoint(self):
+    async def test_skills_endpoint(self):
         """Test GET /api/skills endpoint"""
         try:
-            response = self.make_request("GET", "/skills")
+            response = await self.make_request("GET", "/skills")
             
             if response.status_code == 200:
                 data = response.json()
@@ -136,10 +167,10 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Skills Data", False, f"Exception occurred: {str(e)}")
     
-    def test_experience_endpoint(self):
+    async def test_experience_endpoint(self):
         """Test GET /api/experience endpoint"""
         try:
-            response = self.make_request("GET", "/experience")
+            response = await self.make_request("GET", "/experience")
             
             if response.status_code == 200:
                 data = response.json()
@@ -176,10 +207,10 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Experience Data", False, f"Exception occurred: {str(e)}")
     
-    def test_projects_endpoint(self):
+    async def test_projects_endpoint(self):
         """Test GET /api/projects endpoint"""
         try:
-            response = self.make_request("GET", "/projects")
+            response = await self.make_request("GET", "/projects")
             
             if response.status_code == 200:
                 data = response.json()
@@ -213,10 +244,10 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Projects Data", False, f"Exception occurred: {str(e)}")
     
-    def test_projects_by_category(self):
+    async def test_projects_by_category(self):
         """Test GET /api/projects?category=Model-Based Development"""
         try:
-            response = self.make_request("GET", "/projects", params={"category": "Model-Based Development"})
+            response = await self.make_request("GET", "/projects", params={"category": "Model-Based Development"})
             
             if response.status_code == 200:
                 data = response.json()
@@ -239,10 +270,10 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Projects by Category", False, f"Exception occurred: {str(e)}")
     
-    def test_testimonials_endpoint(self):
+    async def test_testimonials_endpoint(self):
         """Test GET /api/testimonials endpoint"""
         try:
-            response = self.make_request("GET", "/testimonials")
+            response = await self.make_request("GET", "/testimonials")
             
             if response.status_code == 200:
                 data = response.json()
@@ -277,10 +308,10 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Testimonials Data", False, f"Exception occurred: {str(e)}")
     
-    def test_awards_endpoint(self):
+    async def test_awards_endpoint(self):
         """Test GET /api/awards endpoint"""
         try:
-            response = self.make_request("GET", "/awards")
+            response = await self.make_request("GET", "/awards")
             
             if response.status_code == 200:
                 data = response.json()
@@ -312,7 +343,7 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Awards Data", False, f"Exception occurred: {str(e)}")
     
-    def test_contact_endpoint(self):
+    async def test_contact_endpoint(self):
         """Test POST /api/contact endpoint"""
         try:
             test_contact_data = {
@@ -324,7 +355,7 @@ class PortfolioAPITester:
                 "phone": "+1-313-555-0123"
             }
             
-            response = self.make_request("POST", "/contact", data=test_contact_data)
+            response = await self.make_request("POST", "/contact", data=test_contact_data)
             
             if response.status_code == 200:
                 data = response.json()
@@ -343,10 +374,10 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Contact Form Submission", False, f"Exception occurred: {str(e)}")
     
-    def test_certifications_endpoint(self):
+    async def test_certifications_endpoint(self):
         """Test GET /api/certifications endpoint"""
         try:
-            response = self.make_request("GET", "/certifications")
+            response = await self.make_request("GET", "/certifications")
             
             if response.status_code == 200:
                 data = response.json()
@@ -379,10 +410,10 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Certifications Data", False, f"Exception occurred: {str(e)}")
 
-    def test_stats_endpoint(self):
+    async def test_stats_endpoint(self):
         """Test GET /api/stats endpoint"""
         try:
-            response = self.make_request("GET", "/stats")
+            response = await self.make_request("GET", "/stats")
             
             if response.status_code == 200:
                 data = response.json()
@@ -411,24 +442,48 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("Portfolio Statistics", False, f"Exception occurred: {str(e)}")
     
-    def run_all_tests(self):
-        """Run all API tests"""
+    def checks(self):
+        """Independent endpoint checks, in report order"""
+        return [
+            self.test_health_endpoint,
+            self.test_profile_endpoint,
+            self.test_skills_endpoint,
+            self.test_experience_endpoint,
+            self.test_projects_endpoint,
+            self.test_projects_by_category,
+            self.test_testimonials_endpoint,
+            self.test_certifications_endpoint,
+            self.test_awards_endpoint,
+            self.test_contact_endpoint,
+            self.test_stats_endpoint,
+        ]
+    
+    async def run_check(self, check):
+        """Run one check in its own task so its timing is tracked separately"""
+        check_started.set(time.perf_counter())
+        await check()
+    
+    async def run_all_tests(self):
+        """Run all API tests concurrently"""
         print(f"\n🚀 Starting Backend API Tests for Prasanth Davuluri's Automotive Specialist Portfolio")
-        print(f"Backend URL: {self.base_url}")
+        print(f"Backend URL: {self.base_url}" + (" (in-process)" if self.app is not None else ""))
         print("=" * 80)
         
-        # Run all tests
-        self.test_health_endpoint()
-        self.test_profile_endpoint()
-        self.test_skills_endpoint()
-        self.test_experience_endpoint()
-        self.test_projects_endpoint()
-        self.test_projects_by_category()
-        self.test_testimonials_endpoint()
-        self.test_certifications_endpoint()
-        self.test_awards_endpoint()
-        self.test_contact_endpoint()
-        self.test_stats_endpoint()
+        started = time.perf_counter()
+        async with AsyncExitStack() as stack:
+            transport = None
+            if self.app is not None:
+                if self.run_lifespan:
+                    await stack.enter_async_context(self.app.router.lifespan_context(self.app))
+                transport = httpx.ASGITransport(app=self.app)
+            
+            # One pooled client (keep-alive connections) shared by every check
+            self.client = await stack.enter_async_context(httpx.AsyncClient(
+                base_url=self.base_url, transport=transport, timeout=self.timeout
+            ))
+            await asyncio.gather(*(self.run_check(check) for check in self.checks()))
+            self.client = None
+        elapsed = time.perf_counter() - started
         
         # Print summary
         print("\n" + "=" * 80)
@@ -443,6 +498,11 @@ class PortfolioAPITester:
         print(f"Passed: {passed_tests}")
         print(f"Failed: {failed_tests}")
         print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        print(f"Total Time: {elapsed * 1000:.1f} ms")
+        
+        print("\n⏱️  TIMINGS:")
+        for test in sorted(self.test_results, key=lambda t: t["duration_ms"] or 0, reverse=True):
+            print(f"  {test['test']:<28} {test['duration_ms']:>9.1f} ms")
         
         if self.failed_tests:
             print("\n❌ FAILED TESTS:")
@@ -456,13 +516,34 @@ class PortfolioAPITester:
             "passed": passed_tests,
             "failed": failed_tests,
             "success_rate": (passed_tests/total_tests)*100,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "timings_ms": {test["test"]: test["duration_ms"] for test in self.test_results},
             "failed_tests": self.failed_tests
         }
 
+def load_local_app():
+    """Import the FastAPI app from backend/server.py"""
+    backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+    sys.path.insert(0, backend_dir)
+    from server import app
+    return app
+
 def main():
     """Main function to run the tests"""
-    tester = PortfolioAPITester()
-    results = tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="Verify the portfolio backend API")
+    parser.add_argument("--base-url", help=f"API base URL (default: $BACKEND_URL or {BACKEND_URL})")
+    parser.add_argument("--local", action="store_true", help="Test backend/server.py in-process")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+    
+    app = load_local_app() if args.local else None
+    tester = PortfolioAPITester(base_url=args.base_url, app=app, timeout=args.timeout)
+    results = asyncio.run(tester.run_all_tests())
+    
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(results, output, indent=2, default=str)
     
     # Return exit code based on test results
     return 0 if results["failed"] == 0 else 1
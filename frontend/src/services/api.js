@@ -47,6 +47,13 @@ api.interceptors.response.use(
 
 // API service methods
 export const apiService = {
+  // Whole portfolio in one request (optionally limited to some sections)
+  async getPortfolio(fields = null) {
+    const url = fields ? `/api/portfolio?fields=${encodeURIComponent(fields.join(','))}` : '/api/portfolio';
+    const response = await api.get(url);
+    return response.data;
+  },
+
   // Health check
   async getHealth() {
     const response = await api.get('/api/health');
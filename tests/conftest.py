@@ -0,0 +1,37 @@
+# Shared fixtures: the backend package on sys.path and apps on mongomock-motor
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from core.settings import Settings  # noqa: E402
+
+
+@pytest.fixture
+def mock_mongo(monkeypatch):
+    """Make every app in the test connect to an in-memory mongomock client"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    import core.resources
+    monkeypatch.setattr(core.resources, "AsyncIOMotorClient", mongomock_motor.AsyncMongoMockClient)
+
+
+@pytest.fixture
+def make_settings(tmp_path):
+    """Build Settings for a test app; keyword arguments override variables"""
+    def build(**overrides) -> Settings:
+        environ = {
+            "LOG_LEVEL": "WARNING",
+            "LOG_FORMAT": "text",
+            "INDEX_EXPLAIN_CHECK": "false",
+            "LIVE_REFRESH": "false",
+            "HEALTH_CHECK_INTERVAL_SECONDS": "60",
+            "CONTACT_JOURNAL_PATH": str(tmp_path / "contacts_journal.jsonl"),
+            "CONTACT_FLUSH_INTERVAL_SECONDS": "0.02",
+        }
+        environ.update({name: str(value) for name, value in overrides.items()})
+        return Settings(environ)
+    return build
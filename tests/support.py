@@ -0,0 +1,39 @@
+# Helpers for driving the backend in-process from synchronous tests
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+from pymongo.errors import ServerSelectionTimeoutError
+
+
+def run(coroutine):
+    """Run a coroutine to completion on a fresh event loop"""
+    return asyncio.run(coroutine)
+
+
+@asynccontextmanager
+async def serving(app):
+    """Run the app's lifespan and yield an HTTP client talking to it"""
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+
+class Outage:
+    """Wraps a Motor collection; every call fails while ``down`` is set"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.down = False
+
+    def __getattr__(self, name):
+        attribute = getattr(self.collection, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            if self.down:
+                raise ServerSelectionTimeoutError("database is down")
+            return attribute(*args, **kwargs)
+        return call
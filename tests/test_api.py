@@ -0,0 +1,71 @@
+import json
+
+import server
+from core.pagination import encode_cursor
+from data.prasanth_data import DEFAULT_PROJECTS
+from tests.support import run, serving
+
+
+def test_list_pages_follow_the_next_cursor(mock_mongo, make_settings):
+    async def scenario():
+        async with serving(server.create_app(make_settings())) as client:
+            seen, cursor = [], None
+            while True:
+                params = {"limit": 2, "fields": "title"}
+                if cursor:
+                    params["cursor"] = cursor
+                response = await client.get("/api/projects", params=params)
+                assert response.status_code == 200
+                page = response.json()
+                # The keyset field used for the cursor is not part of the selection
+                assert all(list(doc) == ["title"] for doc in page)
+                seen.extend(doc["title"] for doc in page)
+                cursor = response.headers.get("x-next-cursor")
+                if not cursor:
+                    break
+
+            expected = [p["title"] for p in sorted(DEFAULT_PROJECTS, key=lambda p: p["id"])]
+            assert seen == expected
+    run(scenario())
+
+
+def test_mistyped_cursor_is_a_bad_request(mock_mongo, make_settings):
+    async def scenario():
+        async with serving(server.create_app(make_settings())) as client:
+            for cursor in ["not-a-cursor", encode_cursor([{"$gt": ""}]), encode_cursor(["a", "b"])]:
+                response = await client.get("/api/projects", params={"limit": 2, "cursor": cursor})
+                assert response.status_code == 400
+    run(scenario())
+
+
+def test_ndjson_stream_has_one_document_per_line(mock_mongo, make_settings):
+    async def scenario():
+        async with serving(server.create_app(make_settings())) as client:
+            response = await client.get("/api/projects", params={"format": "ndjson", "fields": "id"})
+            assert response.status_code == 200
+            lines = response.text.splitlines()
+            assert sorted(json.loads(line)["id"] for line in lines) == sorted(
+                p["id"] for p in DEFAULT_PROJECTS
+            )
+    run(scenario())
+
+
+def test_next_cursor_is_readable_cross_origin(mock_mongo, make_settings):
+    async def scenario():
+        async with serving(server.create_app(make_settings())) as client:
+            response = await client.get(
+                "/api/projects", params={"limit": 1}, headers={"Origin": "https://admin.example"}
+            )
+            assert "X-Next-Cursor" in response.headers["access-control-expose-headers"]
+    run(scenario())
+
+
+def test_content_revalidates_with_etag(mock_mongo, make_settings):
+    async def scenario():
+        async with serving(server.create_app(make_settings())) as client:
+            for path in ["/api/skills", "/api/portfolio", "/api/stats"]:
+                first = await client.get(path, headers={"Accept-Encoding": "gzip"})
+                assert first.status_code == 200
+                again = await client.get(path, headers={"If-None-Match": first.headers["etag"]})
+                assert again.status_code == 304
+    run(scenario())
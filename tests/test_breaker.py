@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from core.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from tests.support import run
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise ServerSelectionTimeoutError("down")
+
+
+async def trip(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.min_calls):
+        with pytest.raises(ServerSelectionTimeoutError):
+            await breaker.call(fail)
+
+
+def test_opens_once_failure_rate_is_reached():
+    async def scenario():
+        breaker = CircuitBreaker(min_calls=4, failure_rate=0.5, reset_timeout=60)
+        await breaker.call(succeed)
+        await breaker.call(succeed)
+        with pytest.raises(ServerSelectionTimeoutError):
+            await breaker.call(fail)
+        assert breaker.state == CLOSED
+
+        with pytest.raises(ServerSelectionTimeoutError):
+            await breaker.call(fail)
+        assert breaker.state == OPEN
+        assert breaker.trips == 1
+
+        with pytest.raises(CircuitOpenError) as error:
+            await breaker.call(succeed)
+        assert 0 < error.value.retry_after <= 60
+        assert breaker.rejected == 1
+    run(scenario())
+
+
+def test_probe_success_closes_the_circuit():
+    async def scenario():
+        breaker = CircuitBreaker(min_calls=2, reset_timeout=0.01)
+        await trip(breaker)
+        time.sleep(0.02)
+        assert breaker.state == HALF_OPEN
+        assert breaker.retry_after() == 0.0
+
+        assert await breaker.call(succeed) == "ok"
+        assert breaker.state == CLOSED
+        assert breaker.stats()["calls"] == 0
+    run(scenario())
+
+
+def test_probe_failure_reopens_the_circuit():
+    async def scenario():
+        breaker = CircuitBreaker(min_calls=2, reset_timeout=0.01)
+        await trip(breaker)
+        time.sleep(0.02)
+
+        with pytest.raises(ServerSelectionTimeoutError):
+            await breaker.call(fail)
+        assert breaker.state == OPEN
+        assert breaker.trips == 2
+    run(scenario())
+
+
+def test_half_open_admits_one_probe_at_a_time():
+    async def scenario():
+        breaker = CircuitBreaker(min_calls=2, reset_timeout=0.01)
+        await trip(breaker)
+        time.sleep(0.02)
+
+        release = asyncio.Event()
+
+        async def slow_probe():
+            await release.wait()
+            return "ok"
+
+        probe = asyncio.ensure_future(breaker.call(slow_probe))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(succeed)
+        release.set()
+        assert await probe == "ok"
+        assert breaker.state == CLOSED
+    run(scenario())
+
+
+def test_errors_that_are_not_transient_do_not_count():
+    async def scenario():
+        breaker = CircuitBreaker(min_calls=2)
+
+        async def bad_query():
+            raise ValueError("bad query")
+
+        for _ in range(5):
+            with pytest.raises(ValueError):
+                await breaker.call(bad_query)
+        assert breaker.state == CLOSED
+        assert breaker.stats()["calls"] == 0
+    run(scenario())
+
+
+def test_slow_calls_time_out_and_count_as_failures():
+    async def scenario():
+        breaker = CircuitBreaker(min_calls=1, call_timeout=0.01)
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(hang)
+        assert breaker.state == OPEN
+    run(scenario())
+
+
+def test_cancelling_a_call_cancels_the_caller():
+    async def scenario():
+        breaker = CircuitBreaker(min_calls=1, call_timeout=5)
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(breaker.call(hang))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # A cancelled call says nothing about the database
+        assert breaker.state == CLOSED
+        assert breaker.stats()["calls"] == 0
+    run(scenario())
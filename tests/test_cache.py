@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+
+from core.cache import CollectionCache
+from core.responses import RenderedContent
+from core.singleflight import SingleFlight
+from tests.support import run
+
+
+class Loader:
+    """Counts loads and returns whatever ``value`` holds (or raises ``error``)"""
+
+    def __init__(self, value=None):
+        self.value = value
+        self.error = None
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.error:
+            raise self.error
+        return self.value
+
+
+def test_concurrent_misses_share_one_load():
+    async def scenario():
+        cache = CollectionCache()
+        loader = Loader(["a"])
+        results = await asyncio.gather(*(cache.get_or_load("skills", loader) for _ in range(10)))
+        assert results == [["a"]] * 10
+        assert loader.calls == 1
+    run(scenario())
+
+
+def test_expired_entry_is_served_while_it_revalidates():
+    async def scenario():
+        cache = CollectionCache(ttl_seconds=0.2)
+        loader = Loader("v1")
+        assert await cache.get_or_load("skills", loader) == "v1"
+        time.sleep(0.25)
+
+        loader.value = "v2"
+        assert await cache.get_or_load("skills", loader) == "v1"
+        await asyncio.sleep(0.05)
+        assert await cache.get_or_load("skills", loader) == "v2"
+        assert cache.stats()["staleHits"] == 1
+    run(scenario())
+
+
+def test_failed_load_falls_back_to_last_good_value():
+    async def scenario():
+        cache = CollectionCache()
+        loader = Loader("v1")
+        await cache.get_or_load("skills", loader)
+        cache.invalidate("skills")
+
+        loader.error = ConnectionError("down")
+        assert await cache.get_or_load("skills", loader) == "v1"
+        assert cache.stats()["fallbacks"] == 1
+
+        with pytest.raises(ConnectionError):
+            await cache.get_or_load("awards", loader)
+    run(scenario())
+
+
+def test_refresh_keeps_the_held_value_when_the_version_is_unchanged():
+    async def scenario():
+        cache = CollectionCache()
+        loader = Loader(RenderedContent(b'["a"]'))
+        held = await cache.get_or_load("skills", loader)
+
+        loader.value = RenderedContent(b'["a"]')
+        assert await cache.refresh("skills") == set()
+        assert await cache.get_or_load("skills", loader) is held
+
+        loader.value = RenderedContent(b'["b"]')
+        assert await cache.refresh("skills") == {"skills"}
+        assert (await cache.get_or_load("skills", loader)).body == b'["b"]'
+    run(scenario())
+
+
+def test_singleflight_shares_outcome_and_survives_a_cancelled_waiter():
+    async def scenario():
+        flights = SingleFlight()
+        loader = Loader("shared")
+        first = asyncio.ensure_future(flights.do("key", loader))
+        second = asyncio.ensure_future(flights.do("key", loader))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "shared"
+        assert first.cancelled()
+        assert loader.calls == 1
+        assert flights.stats() == {"inFlight": 0, "executed": 1, "coalesced": 1}
+    run(scenario())
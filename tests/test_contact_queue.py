@@ -0,0 +1,102 @@
+import asyncio
+import glob
+
+import pytest
+
+from core.breaker import CircuitBreaker
+from core.contact_queue import ContactWriteQueue
+from tests.support import Outage, run
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+async def contacts_collection():
+    collection = mongomock_motor.AsyncMongoMockClient()["test"]["contacts"]
+    await collection.create_index("id", unique=True)
+    return collection
+
+
+async def stored_ids(collection):
+    return sorted(doc["id"] for doc in await collection.find({}, {"_id": 0}).to_list(None))
+
+
+def test_overflow_is_journaled_and_replayed_on_start(tmp_path):
+    async def scenario():
+        collection = await contacts_collection()
+        journal = str(tmp_path / "journal.jsonl")
+        queue = ContactWriteQueue(collection, journal, max_size=2, flush_interval=0.01)
+
+        # No worker yet, so everything past the queue's capacity spills
+        for i in range(5):
+            await queue.submit({"id": str(i)})
+        assert queue.journaled == 3
+
+        await queue.start()
+        await queue.stop()
+        assert await stored_ids(collection) == ["0", "1", "2", "3", "4"]
+        assert glob.glob(journal + "*") == []
+    run(scenario())
+
+
+def test_replay_skips_documents_already_written(tmp_path):
+    async def scenario():
+        collection = await contacts_collection()
+        await collection.insert_one({"id": "a"})
+        journal = tmp_path / "journal.jsonl"
+        journal.write_text('{"id":"a"}\n{"id":"b"}\n')
+
+        queue = ContactWriteQueue(collection, str(journal), flush_interval=0.01)
+        await queue.start()
+        await queue.stop()
+        assert await stored_ids(collection) == ["a", "b"]
+        assert not journal.exists()
+    run(scenario())
+
+
+def test_journal_is_replayed_by_the_worker_after_an_outage(tmp_path):
+    async def scenario():
+        collection = await contacts_collection()
+        outage = Outage(collection)
+        journal = str(tmp_path / "journal.jsonl")
+        breaker = CircuitBreaker(min_calls=1, reset_timeout=0.05)
+        queue = ContactWriteQueue(
+            outage, journal, max_size=2, flush_interval=0.01,
+            max_retries=2, retry_base_delay=0.01, breaker=breaker
+        )
+        await queue.start()
+
+        outage.down = True
+        for i in range(6):
+            await queue.submit({"id": str(i)})
+        await asyncio.sleep(0.3)
+        assert queue.written == 0
+        assert queue.journaled > 0
+
+        outage.down = False
+        for _ in range(100):
+            if queue.written == 6:
+                break
+            await asyncio.sleep(0.05)
+        await queue.stop()
+
+        assert await stored_ids(collection) == [str(i) for i in range(6)]
+        assert glob.glob(journal + "*") == []
+    run(scenario())
+
+
+def test_batch_held_at_shutdown_is_journaled(tmp_path):
+    async def scenario():
+        collection = await contacts_collection()
+        journal = tmp_path / "journal.jsonl"
+        breaker = CircuitBreaker(min_calls=1, reset_timeout=60)
+        breaker._open()
+        queue = ContactWriteQueue(collection, str(journal), flush_interval=0.01, breaker=breaker)
+        await queue.start()
+
+        await queue.submit({"id": "held"})
+        await asyncio.sleep(0.05)
+        assert queue.stats()["inFlight"] == 1
+
+        await asyncio.wait_for(queue.stop(), 5)
+        assert journal.read_text() == '{"id":"held"}\n'
+    run(scenario())
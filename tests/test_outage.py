@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+import server
+from core.breaker import OPEN
+from core.repository import ContentRepository
+from tests.support import Outage, run, serving
+
+CONTENT_ROUTES = [
+    "/api/profile", "/api/skills", "/api/experience", "/api/projects",
+    "/api/testimonials", "/api/certifications", "/api/awards", "/api/portfolio",
+]
+
+
+@pytest.fixture
+def content_outage(monkeypatch):
+    """Make every content read fail while ``down`` is set"""
+    state = {"down": False}
+    collection = ContentRepository.collection
+
+    def failing_collection(self, spec):
+        if state["down"]:
+            raise ServerSelectionTimeoutError("database is down")
+        return collection(self, spec)
+
+    monkeypatch.setattr(ContentRepository, "collection", failing_collection)
+    return state
+
+
+def test_content_routes_return_503_when_nothing_is_cached(mock_mongo, make_settings, content_outage):
+    async def scenario():
+        app = server.create_app(make_settings(BREAKER_MIN_CALLS="100"))
+        async with serving(app) as client:
+            content_outage["down"] = True
+            for path in CONTENT_ROUTES:
+                response = await client.get(path)
+                assert response.status_code == 503, path
+                assert int(response.headers["retry-after"]) >= 1
+    run(scenario())
+
+
+def test_cached_content_is_served_through_an_outage(mock_mongo, make_settings, content_outage):
+    async def scenario():
+        app = server.create_app(make_settings())
+        async with serving(app) as client:
+            before = {path: (await client.get(path)).content for path in CONTENT_ROUTES}
+
+            content_outage["down"] = True
+            # Dropped entries fall back to the last value loaded for them
+            app.state.resources.cache.invalidate()
+            for path in CONTENT_ROUTES:
+                response = await client.get(path)
+                assert response.status_code == 200, path
+                assert response.content == before[path]
+    run(scenario())
+
+
+def test_open_circuit_fails_fast(mock_mongo, make_settings, content_outage):
+    async def scenario():
+        app = server.create_app(make_settings(BREAKER_MIN_CALLS="2", BREAKER_RESET_SECONDS="30"))
+        async with serving(app) as client:
+            content_outage["down"] = True
+            for _ in range(3):
+                await client.get("/api/skills")
+            breaker = app.state.resources.breaker
+            assert breaker.state == OPEN
+
+            rejected = breaker.rejected
+            response = await client.get("/api/awards")
+            assert response.status_code == 503
+            assert int(response.headers["retry-after"]) > 1
+            assert breaker.rejected == rejected + 1
+    run(scenario())
+
+
+def test_contact_sent_during_an_outage_is_written_after_recovery(mock_mongo, make_settings):
+    async def scenario():
+        app = server.create_app(make_settings(BREAKER_MIN_CALLS="1", BREAKER_RESET_SECONDS="0.1"))
+        async with serving(app) as client:
+            resources = app.state.resources
+            outage = Outage(resources.contact_queue.collection)
+            resources.contact_queue.collection = outage
+
+            outage.down = True
+            response = await client.post("/api/contact", json={
+                "name": "Ada", "email": "ada@example.com", "subject": "Hi", "message": "Hello"
+            })
+            assert response.status_code == 200
+            await asyncio.sleep(0.3)
+            assert await resources.db.contacts.count_documents({}) == 0
+
+            # No restart: the worker writes it once the breaker lets a call through
+            outage.down = False
+            for _ in range(100):
+                if await resources.db.contacts.count_documents({}) == 1:
+                    break
+                await asyncio.sleep(0.05)
+            assert await resources.db.contacts.count_documents({}) == 1
+    run(scenario())
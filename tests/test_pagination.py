@@ -0,0 +1,79 @@
+import pytest
+from pymongo import DESCENDING
+
+from core.pagination import (
+    InvalidQuery, KeysetSpec, decode_cursor, encode_cursor, page_in_memory, parse_fields
+)
+from tests.support import run
+
+DOCUMENTS = [
+    {"id": f"p{i:02d}", "year": 2015 + i % 4, "title": f"Project {i}"}
+    for i in range(23)
+]
+
+
+def test_cursor_round_trip():
+    values = ["2024", 7, "p-01", None]
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+@pytest.mark.parametrize("cursor", ["!!!", encode_cursor({"id": "x"}), "e30"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidQuery):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("values", [
+    ["p01"],
+    [2017, "p01", "extra"],
+    ["2017", "p01"],
+    [True, "p01"],
+    [2017, 5],
+    [{"$gt": ""}, "p01"],
+])
+def test_cursor_values_must_match_the_keys(values):
+    spec = KeysetSpec("year", DESCENDING, field_type=int)
+    with pytest.raises(InvalidQuery):
+        spec.after(encode_cursor(values))
+
+
+def test_paging_in_memory_visits_every_document_once_in_order():
+    spec = KeysetSpec("year", DESCENDING, field_type=int)
+    seen, cursor = [], None
+    while True:
+        page, cursor = page_in_memory(DOCUMENTS, spec, cursor, limit=5)
+        seen.extend(doc["id"] for doc in page)
+        if cursor is None:
+            break
+
+    assert seen == [doc["id"] for doc in spec.order(DOCUMENTS)]
+    assert len(set(seen)) == len(DOCUMENTS)
+
+
+def test_mongo_filter_pages_match_in_memory_pages():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+
+    async def scenario():
+        collection = mongomock_motor.AsyncMongoMockClient()["test"]["projects"]
+        await collection.insert_many([dict(doc) for doc in DOCUMENTS])
+        spec = KeysetSpec("year", DESCENDING, field_type=int)
+
+        cursor = None
+        while True:
+            expected, next_cursor = page_in_memory(DOCUMENTS, spec, cursor, limit=4)
+            query = spec.after(cursor) if cursor else {}
+            page = await collection.find(query, {"_id": 0}).sort(spec.sort()).limit(4).to_list(None)
+            assert page == expected
+            if next_cursor is None:
+                break
+            assert spec.cursor_for(page[-1]) == next_cursor
+            cursor = next_cursor
+
+    run(scenario())
+
+
+def test_parse_fields_rejects_unknown_names():
+    assert parse_fields("title, id,title", ["id", "title"]) == ["title", "id"]
+    assert parse_fields(None, ["id"]) is None
+    with pytest.raises(InvalidQuery):
+        parse_fields("title,secret", ["id", "title"])
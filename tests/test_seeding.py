@@ -0,0 +1,28 @@
+import pytest
+
+from core.seeding import SeedDataset, SeedEngine
+from tests.support import run
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def test_unchanged_dataset_is_not_written_again():
+    async def scenario():
+        engine = SeedEngine(mongomock_motor.AsyncMongoMockClient()["test"])
+        dataset = SeedDataset("projects", [{"id": "a"}, {"id": "b"}])
+        assert await engine.sync([dataset]) == ["projects"]
+        assert await engine.sync([dataset]) == []
+    run(scenario())
+
+
+def test_changed_dataset_removes_only_dropped_seed_documents():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["test"]
+        engine = SeedEngine(db)
+        await engine.sync([SeedDataset("projects", [{"id": "a"}, {"id": "b"}])])
+        await db.projects.insert_one({"id": "added-by-admin"})
+
+        await engine.sync([SeedDataset("projects", [{"id": "a", "title": "A"}])])
+        documents = await db.projects.find({}, {"_id": 0}).sort("id").to_list(None)
+        assert documents == [{"id": "a", "title": "A"}, {"id": "added-by-admin"}]
+    run(scenario())
@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+
+import core.tasks
+import server
+from core.cache import CollectionCache
+from core.health import HealthMonitor
+from core.live_refresh import ContentWatcher
+from core.tasks import cancel_and_wait
+from tests.support import run, serving
+
+
+async def swallow_cancellations(times: int, stopped: asyncio.Event) -> None:
+    """Keep running through the first ``times`` cancellations"""
+    swallowed = 0
+    while not stopped.is_set():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            swallowed += 1
+            if swallowed > times:
+                raise
+
+
+@pytest.fixture
+def short_stop_timeout(monkeypatch):
+    monkeypatch.setattr(core.tasks, "STOP_TIMEOUT_SECONDS", 0.1)
+
+
+def test_cancel_and_wait_recancels_a_task_that_swallowed_cancellation():
+    async def scenario():
+        task = asyncio.ensure_future(swallow_cancellations(1, asyncio.Event()))
+        await asyncio.sleep(0)
+        assert await cancel_and_wait(task, timeout=1.0)
+        assert task.cancelled()
+    run(scenario())
+
+
+def test_cancel_and_wait_gives_up_on_a_task_that_never_stops():
+    async def scenario():
+        stopped = asyncio.Event()
+        task = asyncio.ensure_future(swallow_cancellations(100, stopped))
+        await asyncio.sleep(0)
+
+        started = time.monotonic()
+        assert not await cancel_and_wait(task, timeout=0.1)
+        assert time.monotonic() - started < 1.0
+
+        stopped.set()
+        task.cancel()
+        await asyncio.wait({task})
+    run(scenario())
+
+
+def test_watcher_stop_is_bounded(short_stop_timeout):
+    async def scenario():
+        watcher = ContentWatcher(None, CollectionCache(), ["projects"])
+        stopped = asyncio.Event()
+        watcher._task = asyncio.ensure_future(swallow_cancellations(100, stopped))
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(watcher.stop(), 10)
+        assert watcher.mode == "stopped"
+
+        stopped.set()
+    run(scenario())
+
+
+def test_health_monitor_stop_is_bounded(short_stop_timeout):
+    async def scenario():
+        monitor = HealthMonitor(client=None)
+        stopped = asyncio.Event()
+        monitor._task = asyncio.ensure_future(swallow_cancellations(100, stopped))
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(monitor.stop(), 10)
+        assert monitor._task is None
+
+        stopped.set()
+    run(scenario())
+
+
+def test_app_starts_and_stops_with_live_refresh_polling(mock_mongo, make_settings):
+    async def scenario():
+        settings = make_settings(LIVE_REFRESH="true", LIVE_REFRESH_POLL_SECONDS="0.01")
+        for _ in range(3):
+            app = server.create_app(settings)
+            async with serving(app) as client:
+                watcher = app.state.resources.watcher
+                for _ in range(20):
+                    response = await client.get("/api/portfolio")
+                    assert response.status_code == 200
+                    await asyncio.sleep(0.005)
+                assert watcher.mode == "polling"
+            assert watcher._task is None
+    run(asyncio.wait_for(scenario(), 30))